@@ -0,0 +1,99 @@
+# app/benchmarks/cold_start_benchmark.py
+"""
+Cold-start cost of an API worker, measured in fresh interpreter processes
+
+   import_router : importing services.feature_1.feature_1_router, what import-only tooling pays
+   import_main   : importing main (the app object, routes, middleware)
+   startup       : running the app's startup hooks, as uvicorn does before accepting traffic
+   first_request : the first GET /chatbot/system-info/{id} after startup
+   total         : import_main + startup + first_request, i.e. time until a new worker serves
+   ready         : import_main + startup until /ready answers 200 (search indexes built, caches
+                   warmed), when a load balancer starts routing to the worker
+
+Each run starts a new process so nothing is cached between runs; the median per phase is
+reported. By default it runs against the in-memory MongoDB stand-in with --docs synthetic
+records seeded inside each process before timing starts; pass --mongodb-uri (and --docs 0 once
+the server is populated) to measure against a real server. Requires httpx.
+
+Run from the app directory:
+   python -m benchmarks.cold_start_benchmark --runs 5 --docs 5000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PHASES = ("import_router", "import_main", "startup", "first_request", "total", "ready")
+
+def child(docs: int, phase: str) -> dict:
+    """Runs inside the measured process"""
+    if docs:
+        import random
+        from benchmarks.run_benchmarks import make_corpus
+        from database.database_manager import DatabaseManager
+        manager = DatabaseManager()
+        manager.create_indexes()
+        manager.bulk_insert_system_info(make_corpus(docs, random.Random(42)))
+
+    started = time.perf_counter()
+    if phase == "import_router":
+        import services.feature_1.feature_1_router  # noqa: F401
+        return {"import_router": time.perf_counter() - started}
+
+    import main
+    imported = time.perf_counter()
+    from fastapi.testclient import TestClient
+    with TestClient(main.app) as client:
+        ready = time.perf_counter()
+        client.get("/chatbot/system-info/bench_0000000")
+        served = time.perf_counter()
+        while client.get("/ready").status_code != 200:
+            time.sleep(0.005)
+        routable = time.perf_counter()
+    return {
+        "import_main": imported - started,
+        "startup": ready - imported,
+        "first_request": served - ready,
+        "total": served - started,
+        "ready": routable - started
+    }
+
+def run_once(args, phase: str) -> dict:
+    env = dict(os.environ, MONGODB_URI=args.mongodb_uri, LOG_LEVEL="WARNING")
+    command = [sys.executable, "-m", "benchmarks.cold_start_benchmark", "--child", phase, "--docs", str(args.docs)]
+    output = subprocess.run(command, env=env, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API worker cold start")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes per phase; the median is reported")
+    parser.add_argument("--docs", type=int, default=5000, help="Synthetic documents seeded before timing (0 to skip)")
+    parser.add_argument("--mongodb-uri", default="memory://")
+    parser.add_argument("--output", default=None, help="Write the results as JSON")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(child(args.docs, args.child)))
+        return
+
+    samples = {phase: [] for phase in PHASES}
+    for _ in range(args.runs):
+        for phase in ("import_router", "serve"):
+            for name, seconds in run_once(args, phase).items():
+                samples[name].append(seconds)
+
+    results = {phase: round(statistics.median(values) * 1000, 1) for phase, values in samples.items()}
+    print(f"{'phase':<15} {'median ms':>10}")
+    for phase, milliseconds in results.items():
+        print(f"{phase:<15} {milliseconds:>10.1f}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"runs": args.runs, "docs": args.docs, "mongodb_uri": args.mongodb_uri, "median_ms": results}, f, indent=2)
+
+if __name__ == "__main__":
+    main()
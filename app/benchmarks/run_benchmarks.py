@@ -0,0 +1,202 @@
+# app/benchmarks/run_benchmarks.py
+"""
+Reproducible benchmark for the System Chatbot API
+
+Seeds a synthetic corpus of documents.py-style records, then drives main.app in-process
+with a concurrent load generator and reports throughput and p50/p95/p99 latency per endpoint.
+By default it runs against the in-memory MongoDB stand-in (MONGODB_URI=memory://), so no
+mongod is needed; pass --mongodb-uri to benchmark a real server instead. Requires httpx.
+
+Run from the app directory:
+   python -m benchmarks.run_benchmarks --docs 5000 --requests 2000 --concurrency 32
+   python -m benchmarks.run_benchmarks --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+VERBS = ["check", "restart", "stop", "start", "view", "clear", "list", "monitor", "configure", "update"]
+NOUNS = ["disk space", "memory usage", "cpu usage", "server", "service", "system logs", "network",
+         "firewall", "cron jobs", "docker containers", "nginx", "database", "users", "processes", "ports"]
+CATEGORIES = ["server_management", "system_monitoring", "troubleshooting", "service_management",
+              "network", "security", "database"]
+TOOLS = ["systemctl", "journalctl", "df -h", "free -h", "top", "ss -tulpn", "ufw", "crontab -l",
+         "docker ps", "nginx -t", "ps aux", "du -sh"]
+
+def make_corpus(size: int, rng: random.Random, prefix: str = "bench") -> List[Dict]:
+    """Synthetic records in the same shape as documents.py's SYSTEM_DOCUMENTS"""
+    corpus = []
+    for i in range(size):
+        verb, noun = rng.choice(VERBS), rng.choice(NOUNS)
+        corpus.append({
+            "command_id": f"{prefix}_{i:07d}",
+            "command": f"how to {verb} {noun}",
+            "response": f"To {verb} {noun}, run: sudo {rng.choice(TOOLS)} {' '.join(rng.sample(NOUNS, 2))}",
+            "category": rng.choice(CATEGORIES)
+        })
+    return corpus
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(latencies: List[float], errors: int, wall_time: float) -> Dict:
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": round(count / wall_time, 1) if wall_time > 0 else 0.0,
+        "mean_ms": round(sum(latencies) / count * 1000, 3) if count else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if count else 0.0
+    }
+
+async def run_phase(client, total: int, concurrency: int, make_request: Callable, ok_statuses=(200,)) -> Dict:
+    """Issue total requests from concurrency workers and summarize their latencies"""
+    latencies: List[float] = []
+    errors = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, next_index
+        while next_index < total:
+            index = next_index
+            next_index += 1
+            method, url, body = make_request(index)
+            started = time.perf_counter()
+            response = await client.request(method, url, json=body)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code not in ok_statuses:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall_time = time.perf_counter() - started
+    return dict(summarize(latencies, errors, wall_time), wall_time_s=round(wall_time, 3))
+
+async def run_benchmarks(args) -> Dict:
+    import httpx
+    from main import app
+
+    rng = random.Random(args.seed)
+    corpus = make_corpus(args.docs, rng)
+    ids = [doc["command_id"] for doc in corpus]
+    keywords = [f"{verb} {noun}" for verb in VERBS for noun in NOUNS] + NOUNS
+    results: Dict[str, Dict] = {}
+
+    transport = httpx.ASGITransport(app=app)
+    # ASGITransport does not send lifespan events; run startup (index creation, service build) here
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Indexes are built in the background after startup; measure the steady state, not that window
+        while (await client.get("/ready")).status_code != 200:
+            await asyncio.sleep(0.01)
+        # Seeding doubles as the bulk ingestion benchmark
+        batches = [corpus[i:i + args.bulk_batch] for i in range(0, len(corpus), args.bulk_batch)]
+        results["bulk_add_system_info"] = await run_phase(
+            client, len(batches), 1,
+            lambda i: ("POST", "/chatbot/bulk-add-system-info", {"system_info_list": batches[i]})
+        )
+        seed_time = results["bulk_add_system_info"]["wall_time_s"]
+        results["bulk_add_system_info"]["docs_per_second"] = round(args.docs / seed_time, 1) if seed_time else 0.0
+
+        phases = {
+            "search": lambda i: ("POST", "/chatbot/search",
+                                 {"keyword": rng.choice(keywords), "max_results": 10}),
+            "get_system_info_by_id": lambda i: ("GET", f"/chatbot/system-info/{rng.choice(ids)}", None),
+            "list_system_info_page": lambda i: ("GET", "/chatbot/system-info?limit=50", None),
+            "add_system_info": lambda i: ("POST", "/chatbot/add-system-info",
+                                          make_corpus(1, rng, prefix=f"bench_add_{i}")[0]),
+            "update_system_info": lambda i: ("PUT", f"/chatbot/system-info/{ids[i % len(ids)]}",
+                                             {"category": rng.choice(CATEGORIES)}),
+            "delete_system_info": lambda i: ("DELETE", f"/chatbot/system-info/bench_add_{i}_0000000", None),
+        }
+        for name, make_request in phases.items():
+            total = min(args.requests, len(ids)) if name == "update_system_info" else args.requests
+            results[name] = await run_phase(client, total, args.concurrency, make_request)
+            print(f"  {name:<24} done", file=sys.stderr)
+
+    return results
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+def print_report(report: Dict, baseline: Optional[Dict] = None):
+    print(f"\n{'endpoint':<24} {'req':>6} {'err':>5} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, stats in report["results"].items():
+        line = (f"{name:<24} {stats['requests']:>6} {stats['errors']:>5} {stats['throughput_rps']:>9} "
+                f"{stats['p50_ms']:>9} {stats['p95_ms']:>9} {stats['p99_ms']:>9}")
+        previous = (baseline or {}).get("results", {}).get(name)
+        if previous and previous.get("p99_ms"):
+            change = (stats["p99_ms"] - previous["p99_ms"]) / previous["p99_ms"] * 100
+            line += f"   p99 {change:+.1f}% vs baseline"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the System Chatbot API in-process")
+    parser.add_argument("--docs", type=int, default=5000, help="Synthetic corpus size")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=32, help="Concurrent in-flight requests")
+    parser.add_argument("--bulk-batch", type=int, default=1000, help="Documents per bulk-add request while seeding")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for corpus and request mix")
+    parser.add_argument("--mongodb-uri", default="memory://", help="memory:// (default) or a real MongoDB URI")
+    parser.add_argument("--database", default="chatbot_benchmark", help="Database name (use a scratch database)")
+    parser.add_argument("--search-backend", default=None, help="Override SEARCH_BACKEND (mongo or bm25)")
+    parser.add_argument("--write-coalescing", action="store_true", help="Set WRITE_COALESCING_ENABLED for add-system-info")
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON report")
+    parser.add_argument("--compare", default=None, help="Earlier JSON report to compare p99 against")
+    args = parser.parse_args()
+
+    # Config reads the environment once, so this must happen before the app is imported
+    os.environ["MONGODB_URI"] = args.mongodb_uri
+    os.environ["DATABASE_NAME"] = args.database
+    if args.search_backend:
+        os.environ["SEARCH_BACKEND"] = args.search_backend
+    if args.write_coalescing:
+        os.environ["WRITE_COALESCING_ENABLED"] = "true"
+    # Per-request INFO logging would be timed along with the requests; an explicit LOG_LEVEL still wins
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    print(f"Benchmarking {args.docs} documents, {args.requests} requests/endpoint, "
+          f"concurrency {args.concurrency}...", file=sys.stderr)
+    results = asyncio.run(run_benchmarks(args))
+
+    from config.config import Config
+    report = {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "git_revision": git_revision(),
+        "python": platform.python_version(),
+        "parameters": vars(args),
+        "search_backend": Config().SEARCH_BACKEND,
+        "results": results
+    }
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
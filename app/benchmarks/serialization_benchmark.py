@@ -0,0 +1,71 @@
+# app/benchmarks/serialization_benchmark.py
+"""
+Per-document cost of turning database dicts into a JSON list response
+
+   response_model : SystemInfoResponse built by hand per document, then FastAPI's response_model
+                    handling (validate, dump_python(mode="json"), json.dumps in JSONResponse)
+   type_adapter   : one TypeAdapter.validate_python over the list, then dump_json (the fast path
+                    used by /chatbot/system-info, /chatbot/search and /chatbot/system-info/{id})
+
+Needs no database. Run from the app directory:
+   python -m benchmarks.serialization_benchmark --docs 20000 --repeat 5
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from benchmarks.run_benchmarks import make_corpus
+from services.feature_1.feature_1 import SYSTEM_INFO_LIST_ADAPTER, dump_system_info_list
+from services.feature_1.feature_1_schema import SystemInfoResponse
+
+def response_model_path(docs: List[Dict]) -> bytes:
+    models = [
+        SystemInfoResponse(
+            command_id=doc['command_id'],
+            command=doc['command'],
+            response=doc['response'],
+            category=doc['category'],
+            created_at=doc.get('created_at'),
+            updated_at=doc.get('updated_at')
+        )
+        for doc in docs
+    ]
+    content = SYSTEM_INFO_LIST_ADAPTER.dump_python(SYSTEM_INFO_LIST_ADAPTER.validate_python(models), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+def type_adapter_path(docs: List[Dict]) -> bytes:
+    return dump_system_info_list(SYSTEM_INFO_LIST_ADAPTER.validate_python(docs))
+
+def measure(path: Callable[[List[Dict]], bytes], docs: List[Dict], repeat: int) -> float:
+    """Best-of-repeat microseconds per document"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        path(docs)
+        best = min(best, time.perf_counter() - started)
+    return best / len(docs) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare response serialization paths")
+    parser.add_argument("--docs", type=int, default=20000, help="Documents per response")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per path; the best is reported")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    now = datetime.utcnow()
+    docs = [dict(doc, created_at=now, updated_at=now) for doc in make_corpus(args.docs, random.Random(args.seed))]
+    assert response_model_path(docs) == type_adapter_path(docs), "paths must produce identical JSON"
+
+    before = measure(response_model_path, docs, args.repeat)
+    after = measure(type_adapter_path, docs, args.repeat)
+    print(f"{'path':<16} {'us/doc':>8}")
+    print(f"{'response_model':<16} {before:>8.2f}")
+    print(f"{'type_adapter':<16} {after:>8.2f}")
+    print(f"speed-up: {before / after:.2f}x for {args.docs} documents")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# app/cache/hot_set.py
+import threading
+from collections import Counter
+from typing import Dict, Hashable, Tuple
+
+class HotSetTracker:
+    """In-process counts of served searches and documents, drained periodically into MongoDB
+
+    Each worker only counts between flushes; the shared totals in MongoDB are what a new worker
+    warms its caches from. At most max_keys distinct searches are held between drains, so an
+    unflushed tracker cannot grow without bound.
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self.max_keys = max_keys
+        self._queries: Counter = Counter()
+        self._documents: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record_query(self, key: Hashable):
+        with self._lock:
+            if key in self._queries or len(self._queries) < self.max_keys:
+                self._queries[key] += 1
+
+    def record_document(self, command_id: str):
+        with self._lock:
+            if command_id in self._documents or len(self._documents) < self.max_keys:
+                self._documents[command_id] += 1
+
+    def drain(self) -> Tuple[Dict[Hashable, int], Dict[str, int]]:
+        """Counts since the last drain, resetting them"""
+        with self._lock:
+            queries, documents = self._queries, self._documents
+            self._queries, self._documents = Counter(), Counter()
+        return dict(queries), dict(documents)
+
+    def restore(self, queries: Dict[Hashable, int], documents: Dict[str, int]):
+        """Put back counts from a drain whose flush failed, so they go out with the next one"""
+        with self._lock:
+            self._queries.update(queries)
+            self._documents.update(documents)
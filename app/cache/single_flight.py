@@ -0,0 +1,45 @@
+# app/cache/single_flight.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+class SingleFlight:
+    """At most one in-flight call per key: concurrent callers with the same key share its result
+
+    The call runs as its own task and callers await it shielded, so a caller that disconnects
+    does not cancel the work the others are waiting on. Once the call finishes the key is
+    free again; caching the result is left to the caller.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.calls += 1
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future):
+        # forget() may already have let a newer call take this key
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Marks the exception retrieved even when every caller has gone away
+            task.exception()
+
+    def forget(self):
+        """Stop new callers from joining calls already running; those calls still finish for their callers"""
+        self._calls.clear()
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._calls)}
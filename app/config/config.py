@@ -1,7 +1,12 @@
 # app/config/config.py (CHANGED - removed MODEL_NAME and similarity settings)
 import os
+from typing import Dict, Optional
 from dotenv import load_dotenv
 
+def _optional_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else None
+
 class Config:
     _instance = None
     
@@ -16,4 +21,93 @@ class Config:
         self.MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
         self.DATABASE_NAME = os.getenv("DATABASE_NAME", "system_chatbot")
         self.COLLECTION_NAME = os.getenv("COLLECTION_NAME", "system_info")
-        self.MAX_RESULTS = 10
\ No newline at end of file
+        # Create indexes at API startup instead of through migrate.py; on by default only for the
+        # in-memory stand-in, which starts empty in every process
+        self.AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", str(self.MONGODB_URI.startswith("memory://"))).lower() == "true"
+        # Cross-worker coherence: every write bumps a version document holding the last CHANGE_LOG_SIZE
+        # changed IDs; each API worker polls it every COHERENCE_POLL_INTERVAL seconds (0 disables polling).
+        # CHANGE_LOG_MAX_BYTES bounds the logged IDs, keeping the document under MongoDB's 16MB limit
+        self.VERSION_COLLECTION_NAME = os.getenv("VERSION_COLLECTION_NAME", "collection_versions")
+        self.CHANGE_LOG_SIZE = int(os.getenv("CHANGE_LOG_SIZE", "1000"))
+        self.CHANGE_LOG_MAX_BYTES = int(os.getenv("CHANGE_LOG_MAX_BYTES", str(8 * 1024 * 1024)))
+        self.COHERENCE_POLL_INTERVAL = float(os.getenv("COHERENCE_POLL_INTERVAL", "1.0"))
+        # Hot set: every worker adds its search/document counts to HOT_SET_COLLECTION_NAME every
+        # HOT_SET_FLUSH_INTERVAL seconds (0 disables); entries unseen for HOT_SET_WINDOW seconds expire
+        self.HOT_SET_COLLECTION_NAME = os.getenv("HOT_SET_COLLECTION_NAME", "hot_set")
+        self.HOT_SET_FLUSH_INTERVAL = float(os.getenv("HOT_SET_FLUSH_INTERVAL", "30"))
+        self.HOT_SET_WINDOW = int(os.getenv("HOT_SET_WINDOW", "86400"))
+        # Startup warm-up: preload the WARMUP_DOCUMENTS most read entries and the results of the
+        # WARMUP_QUERIES most frequent recent searches; /ready answers 503 until done or out of budget
+        self.WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+        self.WARMUP_TIME_BUDGET = float(os.getenv("WARMUP_TIME_BUDGET", "10"))
+        self.WARMUP_QUERIES = int(os.getenv("WARMUP_QUERIES", "500"))
+        self.WARMUP_DOCUMENTS = int(os.getenv("WARMUP_DOCUMENTS", "1000"))
+        # MongoDB connection pool, timeouts (milliseconds) and wire compression; unset means driver default
+        self.MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+        self.MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+        self.MONGO_MAX_IDLE_TIME_MS = _optional_int("MONGO_MAX_IDLE_TIME_MS")
+        self.MONGO_WAIT_QUEUE_TIMEOUT_MS = _optional_int("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+        self.MONGO_CONNECT_TIMEOUT_MS = _optional_int("MONGO_CONNECT_TIMEOUT_MS")
+        self.MONGO_SOCKET_TIMEOUT_MS = _optional_int("MONGO_SOCKET_TIMEOUT_MS")
+        self.MONGO_SERVER_SELECTION_TIMEOUT_MS = _optional_int("MONGO_SERVER_SELECTION_TIMEOUT_MS")
+        self.MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "")
+        self.MAX_RESULTS = 10
+        # Logging: level (DEBUG/INFO/WARNING/ERROR) and format ("text" or "json")
+        self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+        self.LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+        # Keyword search backend: "mongo" ($text index) or "bm25" (in-process inverted index)
+        self.SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "mongo").lower()
+        # Verbatim questions (normalized command text) are answered from an in-memory map before any search
+        self.EXACT_MATCH_ENABLED = os.getenv("EXACT_MATCH_ENABLED", "true").lower() == "true"
+        # Type-ahead suggestions over command text (/chatbot/autocomplete)
+        self.AUTOCOMPLETE_ENABLED = os.getenv("AUTOCOMPLETE_ENABLED", "true").lower() == "true"
+        self.AUTOCOMPLETE_SCAN_LIMIT = int(os.getenv("AUTOCOMPLETE_SCAN_LIMIT", "5000"))
+        # Typo-tolerant search: trigram index over FUZZY_FIELDS, also used when an exact search finds nothing
+        self.FUZZY_SEARCH_ENABLED = os.getenv("FUZZY_SEARCH_ENABLED", "true").lower() == "true"
+        self.FUZZY_FIELDS = [f.strip() for f in os.getenv("FUZZY_FIELDS", "command").split(",") if f.strip()]
+        self.FUZZY_MIN_SIMILARITY = float(os.getenv("FUZZY_MIN_SIMILARITY", "0.3"))
+        # Semantic search: embeddings of SEMANTIC_FIELDS held in memory; SEMANTIC_EMBEDDER is "hashing"
+        # (offline hashed TF-IDF, SEMANTIC_DIMENSIONS wide) or "sentence-transformers" (loads MODEL_NAME).
+        # Off by default: the embeddings dominate index memory and build time
+        self.SEMANTIC_SEARCH_ENABLED = os.getenv("SEMANTIC_SEARCH_ENABLED", "false").lower() == "true"
+        self.SEMANTIC_EMBEDDER = os.getenv("SEMANTIC_EMBEDDER", "hashing").lower()
+        self.MODEL_NAME = os.getenv("MODEL_NAME", "all-MiniLM-L6-v2")
+        self.SEMANTIC_DIMENSIONS = int(os.getenv("SEMANTIC_DIMENSIONS", "1024"))
+        self.SEMANTIC_FIELDS = [f.strip() for f in os.getenv("SEMANTIC_FIELDS", "command,response").split(",") if f.strip()]
+        self.SEMANTIC_QUANTIZE = os.getenv("SEMANTIC_QUANTIZE", "false").lower() == "true"
+        self.SEMANTIC_MIN_SCORE = float(os.getenv("SEMANTIC_MIN_SCORE", "0.05"))
+        # /chatbot/batch-search: most queries per request and how many run against the backend at once
+        self.MAX_BATCH_QUERIES = int(os.getenv("MAX_BATCH_QUERIES", "50"))
+        self.BATCH_SEARCH_CONCURRENCY = int(os.getenv("BATCH_SEARCH_CONCURRENCY", "8"))
+        # Result cache for /chatbot/search (size 0 disables it)
+        self.SEARCH_CACHE_SIZE = int(os.getenv("SEARCH_CACHE_SIZE", "1024"))
+        self.SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "60"))
+        # Read-through cache for find_by_command_id lookups (size 0 disables it)
+        self.DOCUMENT_CACHE_SIZE = int(os.getenv("DOCUMENT_CACHE_SIZE", "10000"))
+        self.DOCUMENT_CACHE_TTL = float(os.getenv("DOCUMENT_CACHE_TTL", "300"))
+        # Documents per unordered bulk write round trip
+        self.BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+        # Async writes touching at least this many documents update the in-process indexes in a worker thread
+        self.INDEX_OFFLOAD_MIN_DOCS = int(os.getenv("INDEX_OFFLOAD_MIN_DOCS", "500"))
+        # Optional micro-batching of /chatbot/add-system-info: inserts arriving within
+        # WRITE_COALESCING_MAX_DELAY_MS of each other (up to WRITE_COALESCING_MAX_BATCH) share one bulk insert
+        self.WRITE_COALESCING_ENABLED = os.getenv("WRITE_COALESCING_ENABLED", "false").lower() == "true"
+        self.WRITE_COALESCING_MAX_BATCH = int(os.getenv("WRITE_COALESCING_MAX_BATCH", "100"))
+        self.WRITE_COALESCING_MAX_DELAY_MS = float(os.getenv("WRITE_COALESCING_MAX_DELAY_MS", "5"))
+        # Listing: largest page a client may request, and cursor batch size for NDJSON streaming
+        self.MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+        self.STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", "500"))
+    
+    def mongo_client_options(self) -> Dict:
+        """Keyword arguments for MongoClient/AsyncMongoClient built from the pool settings above"""
+        options = {
+            "maxPoolSize": self.MONGO_MAX_POOL_SIZE,
+            "minPoolSize": self.MONGO_MIN_POOL_SIZE,
+            "maxIdleTimeMS": self.MONGO_MAX_IDLE_TIME_MS,
+            "waitQueueTimeoutMS": self.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+            "connectTimeoutMS": self.MONGO_CONNECT_TIMEOUT_MS,
+            "socketTimeoutMS": self.MONGO_SOCKET_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": self.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            "compressors": self.MONGO_COMPRESSORS or None
+        }
+        return {key: value for key, value in options.items() if value is not None}
\ No newline at end of file
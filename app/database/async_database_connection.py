@@ -0,0 +1,39 @@
+# app/database/async_database_connection.py
+from pymongo import AsyncMongoClient
+from config.config import Config
+from database.pool_monitor import pool_monitors
+from observability.mongo_listener import command_listener
+from database.memory_client import AsyncInMemoryClient
+
+class AsyncDatabaseConnection:
+    _client = None
+    _db = None
+    
+    @classmethod
+    def get_client(cls):
+        if cls._client is None:
+            config = Config()
+            if config.MONGODB_URI.startswith("memory://"):
+                cls._client = AsyncInMemoryClient()
+            else:
+                cls._client = AsyncMongoClient(
+                    config.MONGODB_URI,
+                    event_listeners=[pool_monitors["async"], command_listener],
+                    **config.mongo_client_options()
+                )
+        return cls._client
+    
+    @classmethod
+    def get_database(cls):
+        if cls._db is None:
+            config = Config()
+            client = cls.get_client()
+            cls._db = client[config.DATABASE_NAME]
+        return cls._db
+    
+    @classmethod
+    async def close_connection(cls):
+        if cls._client:
+            await cls._client.close()
+            cls._client = None
+            cls._db = None
\ No newline at end of file
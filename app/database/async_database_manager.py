@@ -0,0 +1,352 @@
+# app/database/async_database_manager.py
+import logging
+from typing import List, Dict, Optional
+from database.async_database_connection import AsyncDatabaseConnection
+from database.database_manager import (
+    fix_datetimes, build_projection, content_hash, bulk_write_failures, plan_bulk_update, plan_bulk_delete,
+    plan_sync, apply_bulk_result, plan_change, plan_hot_set
+)
+from config.config import Config
+from observability.metrics import change_log_failures
+from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+class AsyncDatabaseManager:
+    """Non-blocking counterpart of DatabaseManager for use inside the event loop"""
+
+    def __init__(self):
+        self.config = Config()
+        self.db = AsyncDatabaseConnection.get_database()
+        self.collection = self.db[self.config.COLLECTION_NAME]
+        self.versions = self.db[self.config.VERSION_COLLECTION_NAME]
+        self.hot_set = self.db[self.config.HOT_SET_COLLECTION_NAME]
+        self.change_log_failed = False
+
+    async def create_indexes(self) -> List[str]:
+        """Create the collection's indexes (idempotent); run once per deployment by migrate.py, not per process"""
+        return [
+            await self.collection.create_index("command_id", unique=True),
+            await self.collection.create_index("category"),
+            # Add text index for keyword search
+            await self.collection.create_index([("command", "text"), ("response", "text"), ("category", "text")]),
+            # Warm-up reads the most served entries of one kind; entries not served for HOT_SET_WINDOW expire
+            await self.hot_set.create_index([("kind", 1), ("count", -1)]),
+            await self.hot_set.create_index("last_seen", expireAfterSeconds=self.config.HOT_SET_WINDOW)
+        ]
+
+    async def _record_change(self, command_ids: List[str]):
+        """Bump the collection version and log the written IDs so other workers can refresh them"""
+        if not command_ids:
+            return
+        # After a failed bump other workers have missed a write, so the next entry tells them to reload
+        logged_ids = None if self.change_log_failed else command_ids
+        try:
+            await self.versions.update_one(
+                {"_id": self.config.COLLECTION_NAME},
+                plan_change(logged_ids, self.config.CHANGE_LOG_SIZE, self.config.CHANGE_LOG_MAX_BYTES), upsert=True
+            )
+            self.change_log_failed = False
+        except Exception as e:
+            self.change_log_failed = True
+            change_log_failures.inc()
+            logger.error("Change log error, other workers will miss %d written IDs until the next bump: %s",
+                         len(command_ids), e)
+
+    async def get_change_log(self, last: int = 0) -> Dict:
+        """The collection-version document: just seq, or seq with only its last change entries"""
+        projection = {"_id": 0, "seq": 1}
+        if last > 0:
+            projection["changes"] = {"$slice": -last}
+        return await self.versions.find_one({"_id": self.config.COLLECTION_NAME}, projection) or {"seq": 0, "changes": []}
+
+    async def record_hot_set(self, queries: Dict[tuple, int], documents: Dict[str, int]):
+        """Add this worker's search and document counts to the shared hot set in one bulk write"""
+        operations = plan_hot_set(queries, documents, datetime.utcnow())
+        if operations:
+            await self.hot_set.bulk_write(operations, ordered=False)
+
+    async def get_hot_set(self, kind: str, limit: int, since: datetime) -> List[Dict]:
+        """The limit most served "query" or "document" entries last served after since"""
+        cursor = self.hot_set.find({"kind": kind, "last_seen": {"$gte": since}}, {"_id": 0})
+        return await cursor.sort("count", -1).limit(limit).to_list(length=limit)
+
+    async def insert_system_info(self, command_id: str, command: str, response: str, category: str) -> bool:
+        """Insert system information"""
+        document = {
+            "command_id": command_id,
+            "command": command,
+            "response": response,
+            "category": category,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+        return await self.insert_document(document)
+
+    async def insert_document(self, document: Dict) -> bool:
+        """Insert a fully built system information document"""
+        try:
+            document.setdefault("content_hash", content_hash(document))
+            result = await self.collection.insert_one(document)
+            await self._record_change([document["command_id"]])
+            return bool(result.inserted_id)
+        except DuplicateKeyError:
+            logger.debug("Insert skipped, command_id %s already exists", document.get("command_id"))
+            return False
+        except Exception as e:
+            logger.error("Insert error: %s", e)
+            return False
+
+    async def search_by_keyword(self, keyword: str, limit: int = None, fields: Optional[List[str]] = None) -> List[Dict]:
+        """Search documents by keyword using text search"""
+        try:
+            query = {"$text": {"$search": keyword}}
+            # text_score is filled from the $meta score, not stored
+            stored = [field for field in fields if field != "text_score"] if fields else None
+            projection = dict(build_projection(stored), score={"$meta": "textScore"})
+
+            cursor = self.collection.find(query, projection).sort([("score", {"$meta": "textScore"})])
+
+            if limit:
+                cursor = cursor.limit(limit)
+
+            results = await cursor.to_list(length=limit or None)
+            for result in results:
+                fix_datetimes(result)
+            return results
+        except Exception as e:
+            logger.error("Keyword search error: %s", e)
+            return []
+
+    async def find_by_command_id(self, command_id: str) -> Optional[Dict]:
+        """Find document by command ID"""
+        try:
+            result = await self.collection.find_one({"command_id": command_id}, {"_id": 0})
+            if result:
+                fix_datetimes(result)
+            return result
+        except Exception as e:
+            logger.error("Find error: %s", e)
+            return None
+
+    async def update_system_info(self, command_id: str, update_data: Dict) -> bool:
+        """Update system information"""
+        return (await self.find_and_update_system_info(command_id, update_data)) is not None
+
+    async def find_and_update_system_info(self, command_id: str, update_data: Dict) -> Optional[Dict]:
+        """Update system information and return the updated document, or None if it does not exist"""
+        try:
+            update_data["updated_at"] = datetime.utcnow()
+            result = await self.collection.find_one_and_update(
+                {"command_id": command_id},
+                # A partial update cannot recompute the hash; dropping it makes the next sync rewrite the document
+                {"$set": update_data, "$unset": {"content_hash": ""}},
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER
+            )
+            if result:
+                fix_datetimes(result)
+                await self._record_change([command_id])
+            return result
+        except Exception as e:
+            logger.error("Update error: %s", e)
+            return None
+
+    async def delete_system_info(self, command_id: str) -> bool:
+        """Delete system information"""
+        try:
+            result = await self.collection.delete_one({"command_id": command_id})
+            if result.deleted_count:
+                await self._record_change([command_id])
+            return result.deleted_count > 0
+        except Exception as e:
+            logger.error("Delete error: %s", e)
+            return False
+
+    async def get_all_system_info(self, fields: Optional[List[str]] = None) -> List[Dict]:
+        """Get all system information"""
+        try:
+            results = await self.collection.find({}, build_projection(fields)).to_list(length=None)
+            for result in results:
+                fix_datetimes(result)
+            return results
+        except Exception as e:
+            logger.error("Get all error: %s", e)
+            return []
+
+    async def get_system_info_page(self, after: Optional[str], limit: int, fields: Optional[List[str]] = None) -> List[Dict]:
+        """Get up to limit documents ordered by command_id, starting after the given command_id"""
+        try:
+            query = {"command_id": {"$gt": after}} if after else {}
+            cursor = self.collection.find(query, build_projection(fields)).sort("command_id", 1).limit(limit)
+            results = await cursor.to_list(length=limit)
+            for result in results:
+                fix_datetimes(result)
+            return results
+        except Exception as e:
+            logger.error("Get page error: %s", e)
+            return []
+
+    async def iter_system_info(self, batch_size: int = 500, fields: Optional[List[str]] = None):
+        """Yield every document straight from the cursor, batch_size documents per round trip"""
+        cursor = self.collection.find({}, build_projection(fields)).sort("command_id", 1).batch_size(batch_size)
+        async for result in cursor:
+            yield fix_datetimes(result)
+
+    async def find_updated_at(self, command_id: str) -> Optional[datetime]:
+        """Only the updated_at of a document (None if it does not exist), for conditional requests"""
+        result = await self.collection.find_one({"command_id": command_id}, {"_id": 0, "updated_at": 1})
+        return fix_datetimes(result).get("updated_at") if result else None
+
+    async def find_by_command_ids(self, command_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch many documents in one round trip, keyed by command_id"""
+        cursor = self.collection.find({"command_id": {"$in": command_ids}}, {"_id": 0})
+        return {result["command_id"]: fix_datetimes(result) async for result in cursor}
+
+    async def bulk_update_system_info(self, updates: List[Dict], chunk_size: Optional[int] = None) -> Dict:
+        """Apply partial updates ({"command_id": ..., field: value}) with one bulk_write per chunk"""
+        chunk_size = chunk_size or self.config.BULK_CHUNK_SIZE
+        updated_documents, failed_items, seen = [], [], set()
+        for offset in range(0, len(updates), chunk_size):
+            chunk = updates[offset:offset + chunk_size]
+            try:
+                existing = await self.find_by_command_ids([update.get("command_id") for update in chunk])
+                operations, pending, failures = plan_bulk_update(chunk, offset, existing, seen)
+                failed_items.extend(failures)
+                error, written = None, {}
+                if operations:
+                    try:
+                        await self.collection.bulk_write(operations, ordered=False)
+                    except BulkWriteError as e:
+                        error = e
+                    written = await self.find_by_command_ids([item["command_id"] for item in pending])
+                applied = apply_bulk_result(pending, error, failed_items, written)
+                updated_documents.extend(applied)
+                await self._record_change([document["command_id"] for document in applied])
+            except Exception as e:
+                logger.error("Bulk update error: %s", e)
+                failed_items.extend(
+                    {"index": offset + index, "command_id": update.get("command_id", "unknown"), "reason": str(e)}
+                    for index, update in enumerate(chunk)
+                )
+        return {
+            "success": bool(updated_documents),
+            "updated_count": len(updated_documents),
+            "updated_documents": updated_documents,
+            "failed_items": sorted(failed_items, key=lambda item: item["index"])
+        }
+
+    async def bulk_delete_system_info(self, command_ids: List[str], chunk_size: Optional[int] = None) -> Dict:
+        """Delete many documents with one bulk_write per chunk, reporting unknown IDs per item"""
+        chunk_size = chunk_size or self.config.BULK_CHUNK_SIZE
+        deleted_ids, failed_items, seen = [], [], set()
+        for offset in range(0, len(command_ids), chunk_size):
+            chunk = command_ids[offset:offset + chunk_size]
+            try:
+                cursor = self.collection.find({"command_id": {"$in": chunk}}, {"_id": 0, "command_id": 1})
+                existing = {result["command_id"]: result async for result in cursor}
+                operations, pending, failures = plan_bulk_delete(chunk, offset, existing, seen)
+                failed_items.extend(failures)
+                error = None
+                if operations:
+                    try:
+                        await self.collection.bulk_write(operations, ordered=False)
+                    except BulkWriteError as e:
+                        error = e
+                applied = [item["command_id"] for item in apply_bulk_result(pending, error, failed_items)]
+                deleted_ids.extend(applied)
+                await self._record_change(applied)
+            except Exception as e:
+                logger.error("Bulk delete error: %s", e)
+                failed_items.extend(
+                    {"index": offset + index, "command_id": command_id, "reason": str(e)}
+                    for index, command_id in enumerate(chunk)
+                )
+        return {
+            "success": bool(deleted_ids),
+            "deleted_count": len(deleted_ids),
+            "deleted_ids": deleted_ids,
+            "failed_items": sorted(failed_items, key=lambda item: item["index"])
+        }
+
+    async def sync_system_info(self, documents: List[Dict], chunk_size: Optional[int] = None) -> Dict:
+        """Upsert full documents in unordered chunks, skipping any whose content hash is unchanged"""
+        chunk_size = chunk_size or self.config.BULK_CHUNK_SIZE
+        synced_documents, failed_items, seen = [], [], set()
+        inserted_count, unchanged_count = 0, 0
+        for offset in range(0, len(documents), chunk_size):
+            chunk = documents[offset:offset + chunk_size]
+            try:
+                cursor = self.collection.find(
+                    {"command_id": {"$in": [document.get("command_id") for document in chunk]}},
+                    {"_id": 0, "command_id": 1, "content_hash": 1, "created_at": 1}
+                )
+                existing = {result["command_id"]: result async for result in cursor}
+                operations, pending, failures, unchanged = plan_sync(chunk, offset, existing, seen)
+                failed_items.extend(failures)
+                unchanged_count += unchanged
+                error = None
+                if operations:
+                    try:
+                        await self.collection.bulk_write(operations, ordered=False)
+                    except BulkWriteError as e:
+                        error = e
+                applied = apply_bulk_result(pending, error, failed_items)
+                inserted_count += sum(1 for document in applied if document["command_id"] not in existing)
+                synced_documents.extend(applied)
+                await self._record_change([document["command_id"] for document in applied])
+            except Exception as e:
+                logger.error("Sync error: %s", e)
+                failed_items.extend(
+                    {"index": offset + index, "command_id": document.get("command_id", "unknown"), "reason": str(e)}
+                    for index, document in enumerate(chunk)
+                )
+        return {
+            "success": not failed_items,
+            "inserted_count": inserted_count,
+            "updated_count": len(synced_documents) - inserted_count,
+            "unchanged_count": unchanged_count,
+            "synced_documents": synced_documents,
+            "failed_items": sorted(failed_items, key=lambda item: item["index"])
+        }
+
+    async def bulk_insert_system_info(self, documents: List[Dict], chunk_size: Optional[int] = None) -> Dict:
+        """Bulk insert documents in unordered chunks; duplicates are reported per item instead of aborting the batch"""
+        if not documents:
+            return {"success": False, "message": "No documents provided"}
+
+        for doc in documents:
+            if 'created_at' not in doc:
+                doc['created_at'] = datetime.utcnow()
+            if 'updated_at' not in doc:
+                doc['updated_at'] = datetime.utcnow()
+            doc.setdefault('content_hash', content_hash(doc))
+
+        chunk_size = chunk_size or self.config.BULK_CHUNK_SIZE
+        inserted_ids = []
+        failed_items = []
+        for offset in range(0, len(documents), chunk_size):
+            chunk = documents[offset:offset + chunk_size]
+            try:
+                await self.collection.insert_many(chunk, ordered=False)
+                failures = {}
+            except BulkWriteError as e:
+                failures = bulk_write_failures(e, chunk, offset)
+            except Exception as e:
+                logger.error("Bulk insert error: %s", e)
+                failures = {
+                    index: {"index": offset + index, "command_id": doc.get("command_id", "unknown"), "reason": str(e)}
+                    for index, doc in enumerate(chunk)
+                }
+            failed_items.extend(failures.values())
+            inserted_ids.extend(str(doc["_id"]) for index, doc in enumerate(chunk) if index not in failures)
+            await self._record_change([doc["command_id"] for index, doc in enumerate(chunk) if index not in failures])
+
+        return {
+            "success": bool(inserted_ids),
+            "inserted_count": len(inserted_ids),
+            "inserted_ids": inserted_ids,
+            "failed_items": failed_items
+        }
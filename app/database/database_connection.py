@@ -1,6 +1,9 @@
 # app/database/database_connection.py
 from pymongo import MongoClient
 from config.config import Config
+from database.pool_monitor import pool_monitors
+from observability.mongo_listener import command_listener
+from database.memory_client import InMemoryClient
 
 class DatabaseConnection:
     _client = None
@@ -10,7 +13,14 @@ class DatabaseConnection:
     def get_client(cls):
         if cls._client is None:
             config = Config()
-            cls._client = MongoClient(config.MONGODB_URI)
+            if config.MONGODB_URI.startswith("memory://"):
+                cls._client = InMemoryClient()
+            else:
+                cls._client = MongoClient(
+                    config.MONGODB_URI,
+                    event_listeners=[pool_monitors["sync"], command_listener],
+                    **config.mongo_client_options()
+                )
         return cls._client
     
     @classmethod
@@ -1,48 +1,272 @@
 # services/feature_1/feature_1_database_manager.py (FIXED)
-from typing import List, Dict, Optional
+import hashlib
+import json
+import logging
+import uuid
+from typing import List, Dict, Optional, Tuple
 from database.database_connection import DatabaseConnection  # Adjust import path as needed
 from config.config import Config  # Adjust import path as needed
+from observability.metrics import change_log_failures
 from datetime import datetime
+from pymongo import DeleteOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY_ERROR = 11000
+
+# Fields whose content decides whether a synced document changed
+CONTENT_FIELDS = ("command", "response", "category")
+
+def build_projection(fields: Optional[List[str]] = None) -> Dict:
+    """Pymongo projection returning only the requested fields (always with command_id), or everything but _id"""
+    if not fields:
+        return {"_id": 0}
+    return dict({"_id": 0, "command_id": 1}, **{field: 1 for field in fields})
+
+def content_hash(document: Dict) -> str:
+    """Stable digest of the content fields, stored with each document so sync can skip unchanged ones"""
+    payload = json.dumps([document.get(field) for field in CONTENT_FIELDS], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def fix_datetimes(result: Dict) -> Dict:
+    """Replace invalid created_at/updated_at values with a fallback datetime"""
+    for field in ('created_at', 'updated_at'):
+        if field in result and not isinstance(result[field], datetime):
+            if isinstance(result[field], dict):
+                result[field] = datetime.utcnow()  # Fallback for invalid data
+    return result
+
+def bulk_write_failures(error: BulkWriteError, chunk: List[Dict], offset: int) -> Dict[int, Dict]:
+    """Map the per-item write errors of an unordered bulk write back to the items that caused them"""
+    failures = {}
+    for write_error in error.details.get("writeErrors", []):
+        index = write_error["index"]
+        reason = "Command ID already exists" if write_error.get("code") == DUPLICATE_KEY_ERROR else write_error.get("errmsg", "Write failed")
+        failures[index] = {
+            "index": offset + index,
+            "command_id": chunk[index].get("command_id", "unknown"),
+            "reason": reason
+        }
+    return failures
+
+def plan_bulk_update(chunk: List[Dict], offset: int, existing: Dict[str, Dict], seen: set) -> Tuple[List[UpdateOne], List[Dict], List[Dict]]:
+    """Turn partial updates into UpdateOne operations plus the items to confirm once written"""
+    operations, pending, failed_items = [], [], []
+    now = datetime.utcnow()
+    for index, update in enumerate(chunk):
+        command_id = update.get("command_id")
+        fields = {k: v for k, v in update.items() if k != "command_id" and v is not None}
+        reason = None
+        if command_id in seen:
+            reason = "Duplicate command_id in request"
+        elif command_id not in existing:
+            reason = "Command ID not found"
+        elif not fields:
+            reason = "No valid fields provided for update"
+        seen.add(command_id)
+        if reason:
+            failed_items.append({"index": offset + index, "command_id": command_id, "reason": reason})
+            continue
+        fields["updated_at"] = now
+        fields["content_hash"] = content_hash(dict(existing[command_id], **fields))
+        operations.append(UpdateOne({"command_id": command_id}, {"$set": fields}))
+        pending.append({"command_id": command_id, "index": offset + index})
+    return operations, pending, failed_items
+
+def plan_sync(chunk: List[Dict], offset: int, existing: Dict[str, Dict], seen: set) -> Tuple[List[UpdateOne], List[Dict], List[Dict], int]:
+    """Turn full documents into upserts, skipping those whose content hash is unchanged"""
+    operations, pending, failed_items, unchanged = [], [], [], 0
+    now = datetime.utcnow()
+    for index, document in enumerate(chunk):
+        command_id = document.get("command_id")
+        if command_id in seen:
+            failed_items.append({"index": offset + index, "command_id": command_id, "reason": "Duplicate command_id in request"})
+            continue
+        seen.add(command_id)
+        digest = content_hash(document)
+        current = existing.get(command_id)
+        if current is not None and current.get("content_hash") == digest:
+            unchanged += 1
+            continue
+        fields = {field: document.get(field) for field in CONTENT_FIELDS}
+        fields.update(content_hash=digest, updated_at=now)
+        operations.append(UpdateOne(
+            {"command_id": command_id},
+            {"$set": fields, "$setOnInsert": {"created_at": now}},
+            upsert=True
+        ))
+        created_at = current.get("created_at", now) if current is not None else now
+        pending.append(dict(fields, command_id=command_id, created_at=created_at, index=offset + index))
+    return operations, pending, failed_items, unchanged
+
+def plan_bulk_delete(chunk: List[str], offset: int, existing: Dict[str, Dict], seen: set) -> Tuple[List[DeleteOne], List[Dict], List[Dict]]:
+    """Turn command IDs into DeleteOne operations, reporting unknown and repeated IDs per item"""
+    operations, pending, failed_items = [], [], []
+    for index, command_id in enumerate(chunk):
+        reason = None
+        if command_id in seen:
+            reason = "Duplicate command_id in request"
+        elif command_id not in existing:
+            reason = "Command ID not found"
+        seen.add(command_id)
+        if reason:
+            failed_items.append({"index": offset + index, "command_id": command_id, "reason": reason})
+            continue
+        operations.append(DeleteOne({"command_id": command_id}))
+        pending.append({"command_id": command_id, "index": offset + index})
+    return operations, pending, failed_items
+
+def apply_bulk_result(pending: List[Dict], error: Optional[BulkWriteError], failed_items: List[Dict],
+                      written: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+    """Split planned items into those the bulk write applied and per-item failures
+
+    For updates, written holds the documents re-read after the write: an item counts as applied
+    only if its document still exists, and is returned as stored rather than as planned.
+    """
+    failures = bulk_write_failures(error, pending, 0) if error is not None else {}
+    applied = []
+    for position, item in enumerate(pending):
+        if position in failures:
+            failed_items.append(dict(failures[position], index=item["index"]))
+        elif written is None:
+            applied.append({k: v for k, v in item.items() if k != "index"})
+        elif item["command_id"] in written:
+            applied.append(written[item["command_id"]])
+        else:
+            # Deleted between the prefetch and the write, so the update matched nothing
+            failed_items.append({"index": item["index"], "command_id": item["command_id"], "reason": "Command ID not found"})
+    return applied
+
+# Identifies this process in change-log entries, so a worker can skip writes it already applied
+WORKER_ID = uuid.uuid4().hex
+
+# Approximate BSON cost of one ID inside an entry's array, on top of the ID itself (type, key, length, NUL)
+CHANGE_LOG_ID_OVERHEAD = 16
+
+def plan_change(command_ids: Optional[List[str]], log_size: int, max_bytes: int) -> Dict:
+    """Update for the collection-version document: bump seq and append one entry, keeping the last log_size
+
+    Each entry may spend at most max_bytes / log_size bytes on IDs, so a full log stays under
+    max_bytes (and MongoDB's 16MB document limit); larger writes, or command_ids=None, are
+    logged as "reload everything".
+    """
+    if command_ids is not None:
+        command_ids = list(dict.fromkeys(command_ids))
+        size = sum(len(command_id.encode("utf-8")) + CHANGE_LOG_ID_OVERHEAD for command_id in command_ids)
+        if size > max_bytes // log_size:
+            command_ids = None
+    entry = {"origin": WORKER_ID, "ids": command_ids}
+    return {"$inc": {"seq": 1}, "$push": {"changes": {"$each": [entry], "$slice": -log_size}}}
+
+def pending_changes(change_log: Dict, last_seq: int) -> Optional[List[Dict]]:
+    """Entries written after last_seq, or None when the (possibly sliced) log does not reach back that far"""
+    seq, changes = change_log.get("seq", 0), change_log.get("changes", [])
+    missed = seq - last_seq
+    if missed < 0 or missed > len(changes):
+        return None
+    return changes[len(changes) - missed:]
+
+def plan_hot_set(queries: Dict[tuple, int], documents: Dict[str, int], now: datetime) -> List[UpdateOne]:
+    """Upserts adding one worker's search and document counts to the shared hot-set collection"""
+    operations = []
+    for (keyword, max_results, mode, fields), count in queries.items():
+        key = json.dumps([keyword, max_results, mode, list(fields)], ensure_ascii=False)
+        operations.append(UpdateOne(
+            {"_id": "query:" + key},
+            {"$inc": {"count": count}, "$set": {"last_seen": now},
+             "$setOnInsert": {"kind": "query", "keyword": keyword, "max_results": max_results,
+                              "mode": mode, "fields": list(fields)}},
+            upsert=True
+        ))
+    for command_id, count in documents.items():
+        operations.append(UpdateOne(
+            {"_id": "document:" + command_id},
+            {"$inc": {"count": count}, "$set": {"last_seen": now},
+             "$setOnInsert": {"kind": "document", "command_id": command_id}},
+            upsert=True
+        ))
+    return operations
 
 class DatabaseManager:
     def __init__(self):
         self.config = Config()
         self.db = DatabaseConnection.get_database()
         self.collection = self.db[self.config.COLLECTION_NAME]
-        self._create_indexes()
+        self.versions = self.db[self.config.VERSION_COLLECTION_NAME]
+        self.hot_set = self.db[self.config.HOT_SET_COLLECTION_NAME]
+        self.change_log_failed = False
     
-    def _create_indexes(self):
-        """Create necessary indexes for efficient querying"""
-        try:
-            self.collection.create_index("command_id", unique=True)
-            self.collection.create_index("category")
+    def create_indexes(self) -> List[str]:
+        """Create the collection's indexes (idempotent); run once per deployment by migrate.py, not per process"""
+        return [
+            self.collection.create_index("command_id", unique=True),
+            self.collection.create_index("category"),
             # Add text index for keyword search
-            self.collection.create_index([("command", "text"), ("response", "text"), ("category", "text")])
+            self.collection.create_index([("command", "text"), ("response", "text"), ("category", "text")]),
+            # Warm-up reads the most served entries of one kind; entries not served for HOT_SET_WINDOW expire
+            self.hot_set.create_index([("kind", 1), ("count", -1)]),
+            self.hot_set.create_index("last_seen", expireAfterSeconds=self.config.HOT_SET_WINDOW)
+        ]
+    
+    def _record_change(self, command_ids: List[str]):
+        """Bump the collection version and log the written IDs so other workers can refresh them"""
+        if not command_ids:
+            return
+        # After a failed bump other workers have missed a write, so the next entry tells them to reload
+        logged_ids = None if self.change_log_failed else command_ids
+        try:
+            self.versions.update_one(
+                {"_id": self.config.COLLECTION_NAME},
+                plan_change(logged_ids, self.config.CHANGE_LOG_SIZE, self.config.CHANGE_LOG_MAX_BYTES), upsert=True
+            )
+            self.change_log_failed = False
         except Exception as e:
-            print(f"Index creation error: {e}")
+            self.change_log_failed = True
+            change_log_failures.inc()
+            logger.error("Change log error, other workers will miss %d written IDs until the next bump: %s",
+                         len(command_ids), e)
+    
+    def get_change_log(self, last: int = 0) -> Dict:
+        """The collection-version document: just seq, or seq with only its last change entries"""
+        projection = {"_id": 0, "seq": 1}
+        if last > 0:
+            projection["changes"] = {"$slice": -last}
+        return self.versions.find_one({"_id": self.config.COLLECTION_NAME}, projection) or {"seq": 0, "changes": []}
     
     def insert_system_info(self, command_id: str, command: str, response: str, category: str) -> bool:
         """Insert system information (FIXED - removed vector parameter)"""
+        document = {
+            "command_id": command_id,
+            "command": command,
+            "response": response,
+            "category": category,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+        return self.insert_document(document)
+    
+    def insert_document(self, document: Dict) -> bool:
+        """Insert a fully built system information document"""
         try:
-            document = {
-                "command_id": command_id,
-                "command": command,
-                "response": response,
-                "category": category,
-                "created_at": datetime.utcnow(),
-                "updated_at": datetime.utcnow()
-            }
+            document.setdefault("content_hash", content_hash(document))
             result = self.collection.insert_one(document)
+            self._record_change([document["command_id"]])
             return bool(result.inserted_id)
+        except DuplicateKeyError:
+            logger.debug("Insert skipped, command_id %s already exists", document.get("command_id"))
+            return False
         except Exception as e:
-            print(f"Insert error: {e}")
+            logger.error("Insert error: %s", e)
             return False
     
-    def search_by_keyword(self, keyword: str, limit: int = None) -> List[Dict]:
+    def search_by_keyword(self, keyword: str, limit: int = None, fields: Optional[List[str]] = None) -> List[Dict]:
         """Search documents by keyword using text search"""
         try:
             query = {"$text": {"$search": keyword}}
-            projection = {"_id": 0, "score": {"$meta": "textScore"}}
+            # text_score is filled from the $meta score, not stored
+            stored = [field for field in fields if field != "text_score"] if fields else None
+            projection = dict(build_projection(stored), score={"$meta": "textScore"})
             
             cursor = self.collection.find(query, projection).sort([("score", {"$meta": "textScore"})])
             
@@ -53,16 +277,11 @@ class DatabaseManager:
             
             # Fix datetime issues - ensure proper datetime objects
             for result in results:
-                if 'created_at' in result and not isinstance(result['created_at'], datetime):
-                    if isinstance(result['created_at'], dict):
-                        result['created_at'] = datetime.utcnow()  # Fallback for invalid data
-                if 'updated_at' in result and not isinstance(result['updated_at'], datetime):
-                    if isinstance(result['updated_at'], dict):
-                        result['updated_at'] = datetime.utcnow()  # Fallback for invalid data
+                fix_datetimes(result)
             
             return results
         except Exception as e:
-            print(f"Keyword search error: {e}")
+            logger.error("Keyword search error: %s", e)
             return []
     
     def find_by_command_id(self, command_id: str) -> Optional[Dict]:
@@ -72,78 +291,143 @@ class DatabaseManager:
             
             # Fix datetime issues if found
             if result:
-                if 'created_at' in result and not isinstance(result['created_at'], datetime):
-                    if isinstance(result['created_at'], dict):
-                        result['created_at'] = datetime.utcnow()
-                if 'updated_at' in result and not isinstance(result['updated_at'], datetime):
-                    if isinstance(result['updated_at'], dict):
-                        result['updated_at'] = datetime.utcnow()
+                fix_datetimes(result)
             
             return result
         except Exception as e:
-            print(f"Find error: {e}")
+            logger.error("Find error: %s", e)
             return None
     
     def update_system_info(self, command_id: str, update_data: Dict) -> bool:
         """Update system information"""
+        return self.find_and_update_system_info(command_id, update_data) is not None
+    
+    def find_and_update_system_info(self, command_id: str, update_data: Dict) -> Optional[Dict]:
+        """Update system information and return the updated document, or None if it does not exist"""
         try:
             update_data["updated_at"] = datetime.utcnow()
-            result = self.collection.update_one(
+            result = self.collection.find_one_and_update(
                 {"command_id": command_id},
-                {"$set": update_data}
+                # A partial update cannot recompute the hash; dropping it makes the next sync rewrite the document
+                {"$set": update_data, "$unset": {"content_hash": ""}},
+                projection={"_id": 0},
+                return_document=ReturnDocument.AFTER
             )
-            return result.modified_count > 0
+            if result:
+                fix_datetimes(result)
+                self._record_change([command_id])
+            return result
         except Exception as e:
-            print(f"Update error: {e}")
-            return False
+            logger.error("Update error: %s", e)
+            return None
     
     def delete_system_info(self, command_id: str) -> bool:
         """Delete system information"""
         try:
             result = self.collection.delete_one({"command_id": command_id})
+            if result.deleted_count:
+                self._record_change([command_id])
             return result.deleted_count > 0
         except Exception as e:
-            print(f"Delete error: {e}")
+            logger.error("Delete error: %s", e)
             return False
     
-    def get_all_system_info(self) -> List[Dict]:
+    def get_all_system_info(self, fields: Optional[List[str]] = None) -> List[Dict]:
         """Get all system information"""
         try:
-            results = list(self.collection.find({}, {"_id": 0}))
+            results = list(self.collection.find({}, build_projection(fields)))
             
             # Fix datetime issues for all results
             for result in results:
-                if 'created_at' in result and not isinstance(result['created_at'], datetime):
-                    if isinstance(result['created_at'], dict):
-                        result['created_at'] = datetime.utcnow()
-                if 'updated_at' in result and not isinstance(result['updated_at'], datetime):
-                    if isinstance(result['updated_at'], dict):
-                        result['updated_at'] = datetime.utcnow()
+                fix_datetimes(result)
             
             return results
         except Exception as e:
-            print(f"Get all error: {e}")
+            logger.error("Get all error: %s", e)
             return []
     
-    def bulk_insert_system_info(self, documents: List[Dict]) -> Dict:
-        """Bulk insert multiple system information documents"""
-        try:
-            if not documents:
-                return {"success": False, "message": "No documents provided"}
-            
-            # Ensure all documents have proper datetime objects
-            for doc in documents:
-                if 'created_at' not in doc:
-                    doc['created_at'] = datetime.utcnow()
-                if 'updated_at' not in doc:
-                    doc['updated_at'] = datetime.utcnow()
-            
-            result = self.collection.insert_many(documents)
-            return {
-                "success": True,
-                "inserted_count": len(result.inserted_ids),
-                "inserted_ids": [str(id) for id in result.inserted_ids]
-            }
-        except Exception as e:
-            print(f"Bulk insert error: {e}")
-            return {"success": False, "message": str(e)}
+    def find_by_command_ids(self, command_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch many documents in one round trip, keyed by command_id"""
+        results = self.collection.find({"command_id": {"$in": command_ids}}, {"_id": 0})
+        return {result["command_id"]: fix_datetimes(result) for result in results}
+    
+    def sync_system_info(self, documents: List[Dict], chunk_size: Optional[int] = None) -> Dict:
+        """Upsert full documents in unordered chunks, skipping any whose content hash is unchanged"""
+        chunk_size = chunk_size or self.config.BULK_CHUNK_SIZE
+        synced_documents, failed_items, seen = [], [], set()
+        inserted_count, unchanged_count = 0, 0
+        for offset in range(0, len(documents), chunk_size):
+            chunk = documents[offset:offset + chunk_size]
+            try:
+                cursor = self.collection.find(
+                    {"command_id": {"$in": [document.get("command_id") for document in chunk]}},
+                    {"_id": 0, "command_id": 1, "content_hash": 1, "created_at": 1}
+                )
+                existing = {result["command_id"]: result for result in cursor}
+                operations, pending, failures, unchanged = plan_sync(chunk, offset, existing, seen)
+                failed_items.extend(failures)
+                unchanged_count += unchanged
+                error = None
+                if operations:
+                    try:
+                        self.collection.bulk_write(operations, ordered=False)
+                    except BulkWriteError as e:
+                        error = e
+                applied = apply_bulk_result(pending, error, failed_items)
+                inserted_count += sum(1 for document in applied if document["command_id"] not in existing)
+                synced_documents.extend(applied)
+                self._record_change([document["command_id"] for document in applied])
+            except Exception as e:
+                logger.error("Sync error: %s", e)
+                failed_items.extend(
+                    {"index": offset + index, "command_id": document.get("command_id", "unknown"), "reason": str(e)}
+                    for index, document in enumerate(chunk)
+                )
+        return {
+            "success": not failed_items,
+            "inserted_count": inserted_count,
+            "updated_count": len(synced_documents) - inserted_count,
+            "unchanged_count": unchanged_count,
+            "synced_documents": synced_documents,
+            "failed_items": sorted(failed_items, key=lambda item: item["index"])
+        }
+    
+    def bulk_insert_system_info(self, documents: List[Dict], chunk_size: Optional[int] = None) -> Dict:
+        """Bulk insert documents in unordered chunks; duplicates are reported per item instead of aborting the batch"""
+        if not documents:
+            return {"success": False, "message": "No documents provided"}
+        
+        # Ensure all documents have proper datetime objects
+        for doc in documents:
+            if 'created_at' not in doc:
+                doc['created_at'] = datetime.utcnow()
+            if 'updated_at' not in doc:
+                doc['updated_at'] = datetime.utcnow()
+            doc.setdefault('content_hash', content_hash(doc))
+        
+        chunk_size = chunk_size or self.config.BULK_CHUNK_SIZE
+        inserted_ids = []
+        failed_items = []
+        for offset in range(0, len(documents), chunk_size):
+            chunk = documents[offset:offset + chunk_size]
+            try:
+                self.collection.insert_many(chunk, ordered=False)
+                failures = {}
+            except BulkWriteError as e:
+                failures = bulk_write_failures(e, chunk, offset)
+            except Exception as e:
+                logger.error("Bulk insert error: %s", e)
+                failures = {
+                    index: {"index": offset + index, "command_id": doc.get("command_id", "unknown"), "reason": str(e)}
+                    for index, doc in enumerate(chunk)
+                }
+            failed_items.extend(failures.values())
+            inserted_ids.extend(str(doc["_id"]) for index, doc in enumerate(chunk) if index not in failures)
+            self._record_change([doc["command_id"] for index, doc in enumerate(chunk) if index not in failures])
+        
+        return {
+            "success": bool(inserted_ids),
+            "inserted_count": len(inserted_ids),
+            "inserted_ids": inserted_ids,
+            "failed_items": failed_items
+        }
\ No newline at end of file
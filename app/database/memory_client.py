@@ -0,0 +1,471 @@
+# app/database/memory_client.py
+"""
+In-memory stand-in for the subset of the pymongo API used by the database managers.
+
+Selected with MONGODB_URI=memory:// so the API can be exercised without a real mongod.
+The sync and async clients share one process-wide store, like two clients pointed at
+the same server.
+"""
+import re
+import threading
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import DeleteOne, InsertOne, ReplaceOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from pymongo.results import BulkWriteResult, DeleteResult, InsertManyResult, InsertOneResult, UpdateResult
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(str(text).lower())
+
+
+class InMemoryCursor:
+    def __init__(self, collection: "InMemoryCollection", filter: Dict, projection: Optional[Dict]):
+        self._collection = collection
+        self._filter = filter
+        self._projection = projection
+        self._sort = None
+        self._skip = 0
+        self._limit = 0
+        self._results = None
+
+    def sort(self, key_or_list, direction=None):
+        if isinstance(key_or_list, str):
+            key_or_list = [(key_or_list, direction or 1)]
+        self._sort = list(key_or_list)
+        return self
+
+    def skip(self, skip: int):
+        self._skip = skip
+        return self
+
+    def limit(self, limit: int):
+        self._limit = limit
+        return self
+
+    def batch_size(self, batch_size: int):
+        return self
+
+    def _evaluate(self) -> List[Dict]:
+        if self._results is None:
+            self._results = self._collection._run_query(
+                self._filter, self._projection, self._sort, self._skip, self._limit
+            )
+        return self._results
+
+    def __iter__(self):
+        return iter(self._evaluate())
+
+
+class InMemoryCollection:
+    def __init__(self, name: str):
+        self.name = name
+        self._documents: Dict[Any, Dict] = {}
+        # Unique single-field indexes: field -> value -> _id, also used for equality and $in lookups
+        self._unique: Dict[str, Dict[Any, Any]] = {}
+        self._text_fields: List[str] = []
+        self._lock = threading.RLock()
+
+    # ---------- indexes ----------
+
+    def create_index(self, keys, unique: bool = False, **kwargs):
+        if isinstance(keys, str):
+            keys = [(keys, 1)]
+        if unique and len(keys) == 1 and keys[0][0] not in self._unique:
+            field = keys[0][0]
+            with self._lock:
+                self._unique[field] = {
+                    document[field]: document_id
+                    for document_id, document in self._documents.items() if field in document
+                }
+        text_fields = [field for field, kind in keys if kind == "text"]
+        if text_fields:
+            self._text_fields = text_fields
+        return "_".join(f"{field}_{kind}" for field, kind in keys)
+
+    # ---------- matching ----------
+
+    def _text_score(self, document: Dict, search: str) -> float:
+        terms = set(_tokenize(search))
+        if not terms:
+            return 0.0
+        score = 0.0
+        for field in self._text_fields:
+            tokens = _tokenize(document.get(field, ""))
+            if tokens:
+                matched = sum(1 for token in tokens if token in terms)
+                score += matched / len(tokens)
+        return score
+
+    def _matches(self, document: Dict, filter: Dict) -> bool:
+        for key, condition in filter.items():
+            if key == "$text":
+                if self._text_score(document, condition["$search"]) <= 0:
+                    return False
+                continue
+            value = document.get(key)
+            if isinstance(condition, dict) and any(op.startswith("$") for op in condition):
+                for op, operand in condition.items():
+                    if op == "$in" and value not in operand:
+                        return False
+                    if op == "$nin" and value in operand:
+                        return False
+                    if op == "$ne" and value == operand:
+                        return False
+                    if op == "$exists" and (key in document) != bool(operand):
+                        return False
+                    if op in ("$gt", "$gte", "$lt", "$lte"):
+                        if value is None:
+                            return False
+                        if op == "$gt" and not value > operand:
+                            return False
+                        if op == "$gte" and not value >= operand:
+                            return False
+                        if op == "$lt" and not value < operand:
+                            return False
+                        if op == "$lte" and not value <= operand:
+                            return False
+            elif value != condition:
+                return False
+        return True
+
+    def _project(self, document: Dict, projection: Optional[Dict], score: float) -> Dict:
+        if not projection:
+            return dict(document)
+        meta = {k for k, v in projection.items() if isinstance(v, dict) and v.get("$meta") == "textScore"}
+        slices = {k: v["$slice"] for k, v in projection.items() if isinstance(v, dict) and "$slice" in v}
+        flags = {k: v for k, v in projection.items() if k not in meta and k not in slices}
+        included = [k for k, v in flags.items() if v and k != "_id"]
+        if included:
+            # Like MongoDB 4.4+, a $slice next to inclusions includes the sliced array
+            result = {k: document[k] for k in included + list(slices) if k in document}
+            if flags.get("_id", 1) and "_id" in document:
+                result["_id"] = document["_id"]
+        else:
+            result = {k: v for k, v in document.items() if flags.get(k, 1)}
+        for key, count in slices.items():
+            if isinstance(result.get(key), list):
+                result[key] = result[key][count:] if count < 0 else result[key][:count]
+        for key in meta:
+            result[key] = score
+        return result
+
+    def _candidates(self, filter: Dict) -> List[Dict]:
+        """Documents that may match, narrowed through a unique index when the filter allows it"""
+        for field, index in self._unique.items():
+            condition = filter.get(field)
+            if condition is None:
+                continue
+            if isinstance(condition, dict):
+                if "$in" not in condition:
+                    continue
+                values = condition["$in"]
+            else:
+                values = [condition]
+            ids = [index[value] for value in values if value in index]
+            return [self._documents[document_id] for document_id in dict.fromkeys(ids)]
+        return list(self._documents.values())
+
+    def _run_query(self, filter, projection, sort, skip, limit) -> List[Dict]:
+        filter = filter or {}
+        search = filter.get("$text", {}).get("$search")
+        with self._lock:
+            matched = [
+                (document, self._text_score(document, search) if search else 0.0)
+                for document in self._candidates(filter)
+                if self._matches(document, filter)
+            ]
+        for field, direction in reversed(sort or []):
+            if isinstance(direction, dict):
+                matched.sort(key=lambda item: item[1], reverse=True)
+            else:
+                matched.sort(
+                    key=lambda item: (item[0].get(field) is not None, item[0].get(field) or 0),
+                    reverse=direction == -1,
+                )
+        matched = matched[skip:]
+        if limit:
+            matched = matched[:limit]
+        return [self._project(document, projection, score) for document, score in matched]
+
+    # ---------- writes ----------
+
+    def _check_unique(self, document: Dict, ignore_id=None):
+        for field, index in self._unique.items():
+            if field not in document:
+                continue
+            existing_id = index.get(document[field])
+            if existing_id is not None and existing_id != ignore_id:
+                raise DuplicateKeyError(
+                    f"E11000 duplicate key error collection: {self.name} "
+                    f"index: {field}_1 dup key: {{ {field}: {document[field]!r} }}",
+                    code=11000,
+                )
+
+    def _store(self, document_id, document: Optional[Dict]):
+        """Write (or with None, remove) a document and keep the unique indexes in step"""
+        previous = self._documents.get(document_id)
+        for field, index in self._unique.items():
+            if previous is not None and field in previous:
+                index.pop(previous[field], None)
+            if document is not None and field in document:
+                index[document[field]] = document_id
+        if document is None:
+            self._documents.pop(document_id, None)
+        else:
+            self._documents[document_id] = document
+
+    def _insert(self, document: Dict):
+        document.setdefault("_id", ObjectId())
+        with self._lock:
+            if document["_id"] in self._documents:
+                raise DuplicateKeyError("E11000 duplicate key error index: _id_", code=11000)
+            self._check_unique(document)
+            self._store(document["_id"], dict(document))
+        return document["_id"]
+
+    def insert_one(self, document: Dict) -> InsertOneResult:
+        return InsertOneResult(self._insert(document), True)
+
+    def insert_many(self, documents: List[Dict], ordered: bool = True) -> InsertManyResult:
+        inserted_ids = []
+        write_errors = []
+        for index, document in enumerate(documents):
+            try:
+                inserted_ids.append(self._insert(document))
+            except DuplicateKeyError as e:
+                write_errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": document})
+                if ordered:
+                    break
+        if write_errors:
+            raise BulkWriteError({
+                "writeErrors": write_errors, "writeConcernErrors": [], "nInserted": len(inserted_ids),
+                "nUpserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "upserted": []
+            })
+        return InsertManyResult(inserted_ids, True)
+
+    def _find_id(self, filter: Dict):
+        for document in self._candidates(filter):
+            if self._matches(document, filter):
+                return document["_id"]
+        return None
+
+    def _apply_update(self, document: Dict, update: Dict, inserting: bool) -> Dict:
+        updated = dict(document)
+        updated.update(update.get("$set", {}))
+        if inserting:
+            updated.update(update.get("$setOnInsert", {}))
+        for field, amount in update.get("$inc", {}).items():
+            updated[field] = updated.get(field, 0) + amount
+        for field in update.get("$unset", {}):
+            updated.pop(field, None)
+        for field, value in update.get("$push", {}).items():
+            modifiers = value if isinstance(value, dict) and "$each" in value else {"$each": [value]}
+            pushed = list(updated.get(field, [])) + list(modifiers["$each"])
+            if "$slice" in modifiers:
+                limit = modifiers["$slice"]
+                pushed = pushed[limit:] if limit < 0 else pushed[:limit]
+            updated[field] = pushed
+        return updated
+
+    def update_one(self, filter: Dict, update: Dict, upsert: bool = False) -> UpdateResult:
+        with self._lock:
+            document_id = self._find_id(filter)
+            if document_id is None:
+                if not upsert:
+                    return UpdateResult({"n": 0, "nModified": 0}, True)
+                seed = {k: v for k, v in filter.items() if not isinstance(v, dict)}
+                new_id = self._insert(self._apply_update(seed, update, inserting=True))
+                return UpdateResult({"n": 1, "nModified": 0, "upserted": new_id}, True)
+            current = self._documents[document_id]
+            updated = self._apply_update(current, update, inserting=False)
+            self._check_unique(updated, ignore_id=document_id)
+            self._store(document_id, updated)
+            return UpdateResult({"n": 1, "nModified": int(updated != current)}, True)
+
+    def find_one_and_update(self, filter: Dict, update: Dict, projection: Optional[Dict] = None,
+                            return_document: bool = ReturnDocument.BEFORE, upsert: bool = False) -> Optional[Dict]:
+        with self._lock:
+            document_id = self._find_id(filter)
+            before = self._documents.get(document_id) if document_id is not None else None
+            result = self.update_one(filter, update, upsert=upsert)
+            if before is not None:
+                document_id = before["_id"]
+            elif result.upserted_id is not None:
+                document_id = result.upserted_id
+            else:
+                return None
+            document = self._documents[document_id] if return_document == ReturnDocument.AFTER else before
+            return self._project(document, projection, 0.0) if document is not None else None
+
+    def delete_one(self, filter: Dict) -> DeleteResult:
+        with self._lock:
+            document_id = self._find_id(filter)
+            if document_id is None:
+                return DeleteResult({"n": 0}, True)
+            self._store(document_id, None)
+            return DeleteResult({"n": 1}, True)
+
+    def bulk_write(self, requests: List[Any], ordered: bool = True) -> BulkWriteResult:
+        counts = {"nInserted": 0, "nMatched": 0, "nModified": 0, "nRemoved": 0, "nUpserted": 0}
+        upserted = []
+        write_errors = []
+        for index, request in enumerate(requests):
+            try:
+                if isinstance(request, InsertOne):
+                    self._insert(request._doc)
+                    counts["nInserted"] += 1
+                elif isinstance(request, (UpdateOne, ReplaceOne)):
+                    update = request._doc if isinstance(request, UpdateOne) else {"$set": request._doc}
+                    result = self.update_one(request._filter, update, upsert=request._upsert)
+                    if result.upserted_id is not None:
+                        counts["nUpserted"] += 1
+                        upserted.append({"index": index, "_id": result.upserted_id})
+                    else:
+                        counts["nMatched"] += result.matched_count
+                        counts["nModified"] += result.modified_count
+                elif isinstance(request, DeleteOne):
+                    counts["nRemoved"] += self.delete_one(request._filter).deleted_count
+                else:
+                    raise TypeError(f"Unsupported bulk operation: {type(request).__name__}")
+            except DuplicateKeyError as e:
+                write_errors.append({"index": index, "code": 11000, "errmsg": str(e), "op": request._doc})
+                if ordered:
+                    break
+        result = dict(counts, upserted=upserted, writeErrors=write_errors, writeConcernErrors=[])
+        if write_errors:
+            raise BulkWriteError(result)
+        return BulkWriteResult(result, True)
+
+    # ---------- reads ----------
+
+    def find(self, filter: Optional[Dict] = None, projection: Optional[Dict] = None) -> InMemoryCursor:
+        return InMemoryCursor(self, filter or {}, projection)
+
+    def find_one(self, filter: Optional[Dict] = None, projection: Optional[Dict] = None) -> Optional[Dict]:
+        results = self._run_query(filter, projection, None, 0, 1)
+        return results[0] if results else None
+
+    def count_documents(self, filter: Dict) -> int:
+        return len(self._run_query(filter, {"_id": 1}, None, 0, 0))
+
+
+class InMemoryDatabase:
+    def __init__(self, name: str):
+        self.name = name
+        self._collections: Dict[str, InMemoryCollection] = {}
+
+    def command(self, command, **kwargs) -> Dict:
+        return {"ok": 1.0}
+
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        if name not in self._collections:
+            self._collections[name] = InMemoryCollection(name)
+        return self._collections[name]
+
+
+class InMemoryClient:
+    _databases: Dict[str, InMemoryDatabase] = {}
+
+    def __getitem__(self, name: str) -> InMemoryDatabase:
+        if name not in self._databases:
+            self._databases[name] = InMemoryDatabase(name)
+        return self._databases[name]
+
+    def close(self):
+        pass
+
+
+# ============== ASYNC WRAPPERS ==============
+
+class AsyncInMemoryCursor:
+    def __init__(self, cursor: InMemoryCursor):
+        self._cursor = cursor
+
+    def sort(self, key_or_list, direction=None):
+        self._cursor.sort(key_or_list, direction)
+        return self
+
+    def skip(self, skip: int):
+        self._cursor.skip(skip)
+        return self
+
+    def limit(self, limit: int):
+        self._cursor.limit(limit)
+        return self
+
+    def batch_size(self, batch_size: int):
+        return self
+
+    async def to_list(self, length: Optional[int] = None) -> List[Dict]:
+        results = self._cursor._evaluate()
+        return list(results[:length] if length else results)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in self._cursor._evaluate():
+            yield document
+
+
+class AsyncInMemoryCollection:
+    def __init__(self, collection: InMemoryCollection):
+        self._collection = collection
+        self.name = collection.name
+
+    async def create_index(self, keys, **kwargs):
+        return self._collection.create_index(keys, **kwargs)
+
+    async def insert_one(self, document: Dict) -> InsertOneResult:
+        return self._collection.insert_one(document)
+
+    async def insert_many(self, documents: List[Dict], ordered: bool = True) -> InsertManyResult:
+        return self._collection.insert_many(documents, ordered=ordered)
+
+    async def update_one(self, filter: Dict, update: Dict, upsert: bool = False) -> UpdateResult:
+        return self._collection.update_one(filter, update, upsert=upsert)
+
+    async def find_one_and_update(self, filter: Dict, update: Dict, **kwargs) -> Optional[Dict]:
+        return self._collection.find_one_and_update(filter, update, **kwargs)
+
+    async def delete_one(self, filter: Dict) -> DeleteResult:
+        return self._collection.delete_one(filter)
+
+    async def bulk_write(self, requests: List[Any], ordered: bool = True) -> BulkWriteResult:
+        return self._collection.bulk_write(requests, ordered=ordered)
+
+    def find(self, filter: Optional[Dict] = None, projection: Optional[Dict] = None) -> AsyncInMemoryCursor:
+        return AsyncInMemoryCursor(self._collection.find(filter, projection))
+
+    async def find_one(self, filter: Optional[Dict] = None, projection: Optional[Dict] = None) -> Optional[Dict]:
+        return self._collection.find_one(filter, projection)
+
+    async def count_documents(self, filter: Dict) -> int:
+        return self._collection.count_documents(filter)
+
+
+class AsyncInMemoryDatabase:
+    def __init__(self, database: InMemoryDatabase):
+        self._database = database
+        self.name = database.name
+
+    async def command(self, command, **kwargs) -> Dict:
+        return self._database.command(command, **kwargs)
+
+    def __getitem__(self, name: str) -> AsyncInMemoryCollection:
+        return AsyncInMemoryCollection(self._database[name])
+
+
+class AsyncInMemoryClient:
+    def __init__(self):
+        self._client = InMemoryClient()
+
+    def __getitem__(self, name: str) -> AsyncInMemoryDatabase:
+        return AsyncInMemoryDatabase(self._client[name])
+
+    async def close(self):
+        pass
@@ -0,0 +1,109 @@
+# app/database/pool_monitor.py
+import threading
+import time
+from typing import Dict
+from pymongo import monitoring
+
+class PoolMonitor(monitoring.ConnectionPoolListener):
+    """Connection pool listener that keeps live checkout, wait-time and pool-cleared counters per server"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: Dict[str, Dict] = {}
+
+    @staticmethod
+    def _key(address) -> str:
+        return f"{address[0]}:{address[1]}" if isinstance(address, tuple) else str(address)
+
+    def _pool(self, address) -> Dict:
+        key = self._key(address)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = {
+                "open_connections": 0,
+                "checked_out": 0,
+                "max_checked_out": 0,
+                "checkouts": 0,
+                "checkout_failures": 0,
+                "wait_time_total_ms": 0.0,
+                "wait_time_max_ms": 0.0,
+                "pool_cleared": 0,
+                "last_cleared_at": None
+            }
+        return pool
+
+    def _record_wait(self, pool: Dict, duration):
+        if duration is None:
+            return
+        wait_ms = duration * 1000
+        pool["wait_time_total_ms"] += wait_ms
+        pool["wait_time_max_ms"] = max(pool["wait_time_max_ms"], wait_ms)
+
+    def pool_created(self, event):
+        with self._lock:
+            self._pool(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["pool_cleared"] += 1
+            pool["last_cleared_at"] = time.time()
+
+    def pool_closed(self, event):
+        with self._lock:
+            self._pools.pop(self._key(event.address), None)
+
+    def connection_created(self, event):
+        with self._lock:
+            self._pool(event.address)["open_connections"] += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["open_connections"] = max(0, pool["open_connections"] - 1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["checkout_failures"] += 1
+            self._record_wait(pool, getattr(event, "duration", None))
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["checkouts"] += 1
+            pool["checked_out"] += 1
+            pool["max_checked_out"] = max(pool["max_checked_out"], pool["checked_out"])
+            self._record_wait(pool, getattr(event, "duration", None))
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            pool = self._pool(event.address)
+            pool["checked_out"] = max(0, pool["checked_out"] - 1)
+
+    def stats(self) -> Dict[str, Dict]:
+        with self._lock:
+            result = {}
+            for address, pool in self._pools.items():
+                attempts = pool["checkouts"] + pool["checkout_failures"]
+                result[address] = dict(
+                    pool,
+                    wait_time_avg_ms=pool["wait_time_total_ms"] / attempts if attempts else 0.0
+                )
+            return result
+
+# One listener per client: the sync and async clients keep separate pools to the same servers
+pool_monitors = {"sync": PoolMonitor(), "async": PoolMonitor()}
+
+def pool_stats() -> Dict[str, Dict[str, Dict]]:
+    """Pool counters keyed by client, then by server"""
+    return {client: monitor.stats() for client, monitor in pool_monitors.items()}
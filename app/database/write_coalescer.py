@@ -0,0 +1,77 @@
+# app/database/write_coalescer.py
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+class WriteCoalescer:
+    """Micro-batches single writes made inside the event loop into one bulk write
+
+    Items wait at most max_delay seconds, or until max_batch are buffered, and are then handed
+    to write_batch together. write_batch returns one result per item, in order; each caller
+    awaits only its own. If write_batch raises, every caller in that batch gets the exception.
+    """
+
+    def __init__(self, write_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_batch: int = 100, max_delay: float = 0.005):
+        self.write_batch = write_batch
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Strong references, so in-flight flushes are not garbage-collected mid-write
+        self._flushes: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Queue one item and wait for its own result from the batch it is written in"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._write(batch))
+            self._flushes.add(task)
+            task.add_done_callback(self._flushes.discard)
+
+    async def _write(self, batch: List[Tuple[Any, asyncio.Future]]):
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            results = await self.write_batch([item for item, _ in batch])
+        except Exception as e:
+            logger.error("Coalesced write of %d items failed: %s", len(batch), e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            # A caller that was cancelled while waiting has nobody to receive its result
+            if not future.done():
+                future.set_result(result)
+
+    async def drain(self):
+        """Write whatever is buffered and wait for every in-flight batch"""
+        self._flush()
+        if self._flushes:
+            await asyncio.gather(*self._flushes, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "average_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "pending": len(self._pending)
+        }
@@ -6,7 +6,6 @@ Run this file to populate your database with sample system information
 
 import sys
 import os
-from sentence_transformers import SentenceTransformer
 from typing import List, Dict
 
 # Add the app directory to Python path
@@ -19,18 +18,10 @@ class DocumentInserter:
     def __init__(self):
         self.config = Config()
         self.db_manager = DatabaseManager()
-        self.model = SentenceTransformer(self.config.MODEL_NAME)
+        # The duplicate check relies on the unique command_id index; a no-op once migrate.py has run
+        self.db_manager.create_indexes()
         print("DocumentInserter initialized successfully!")
     
-    def vectorize_text(self, text: str) -> List[float]:
-        """Convert text to vector using SBERT"""
-        try:
-            embedding = self.model.encode(text)
-            return embedding.tolist()
-        except Exception as e:
-            print(f"Vectorization error: {e}")
-            return []
-    
     def add_single_document(self, command_id: str, command: str, response: str, category: str) -> bool:
         """Add a single document to MongoDB"""
         try:
@@ -40,19 +31,12 @@ class DocumentInserter:
                 print(f"Warning: Command ID '{command_id}' already exists. Skipping...")
                 return False
             
-            # Vectorize the command
-            vector = self.vectorize_text(command)
-            if not vector:
-                print(f"Error: Failed to vectorize command '{command_id}'")
-                return False
-            
-            # Insert into database
+            # Insert into database (the API embeds documents for semantic search when it loads them)
             success = self.db_manager.insert_system_info(
                 command_id=command_id,
                 command=command,
                 response=response,
-                category=category,
-                vector=vector
+                category=category
             )
             
             if success:
@@ -70,29 +54,13 @@ class DocumentInserter:
         """Add multiple documents to MongoDB"""
         print(f"Starting bulk insert of {len(documents)} documents...")
         
-        successful = 0
-        failed = 0
-        failed_items = []
-        
-        for doc in documents:
-            try:
-                success = self.add_single_document(
-                    command_id=doc['command_id'],
-                    command=doc['command'],
-                    response=doc['response'],
-                    category=doc['category']
-                )
-                
-                if success:
-                    successful += 1
-                else:
-                    failed += 1
-                    failed_items.append(doc['command_id'])
-                    
-            except Exception as e:
-                print(f"Error processing document: {e}")
-                failed += 1
-                failed_items.append(doc.get('command_id', 'unknown'))
+        # One unordered bulk write per chunk; existing command_ids are reported instead of aborting
+        insert_result = self.db_manager.bulk_insert_system_info(
+            [{key: doc.get(key) for key in ('command_id', 'command', 'response', 'category')} for doc in documents]
+        )
+        successful = insert_result.get('inserted_count', 0)
+        failed_items = [item['command_id'] for item in insert_result.get('failed_items', [])]
+        failed = len(documents) - successful
         
         result = {
             'total_attempted': len(documents),
@@ -111,6 +79,16 @@ class DocumentInserter:
         
         return result
 
+    def sync_documents(self, documents: List[Dict]) -> Dict:
+        """Insert new documents, update changed ones and skip those whose content hash is unchanged"""
+        print(f"Syncing {len(documents)} documents...")
+        result = self.db_manager.sync_system_info(
+            [{key: doc.get(key) for key in ('command_id', 'command', 'response', 'category')} for doc in documents]
+        )
+        print(f"Inserted: {result['inserted_count']}, updated: {result['updated_count']}, "
+              f"unchanged: {result['unchanged_count']}, failed: {len(result['failed_items'])}")
+        return result
+
 # ============== SAMPLE DOCUMENTS ==============
 # Add your documents here
 SYSTEM_DOCUMENTS = [
@@ -266,8 +244,9 @@ def main():
         print("3. Insert database documents (3 documents)")
         print("4. Insert all documents (21 documents)")
         print("5. Insert custom documents (modify the CUSTOM_DOCS list)")
+        print("6. Sync all documents (insert new, update changed, skip unchanged)")
         
-        choice = input("\nEnter your choice (1-5): ").strip()
+        choice = input("\nEnter your choice (1-6): ").strip()
         
         if choice == "1":
             result = inserter.add_multiple_documents(SYSTEM_DOCUMENTS)
@@ -290,6 +269,10 @@ def main():
                 # Add more custom documents here
             ]
             result = inserter.add_multiple_documents(CUSTOM_DOCS)
+        elif choice == "6":
+            # sync_documents prints its inserted/updated/unchanged counts; unchanged ones were not inserted
+            inserter.sync_documents(SYSTEM_DOCUMENTS + SERVER_MANAGEMENT_DOCS + DATABASE_DOCS)
+            return
         else:
             print("Invalid choice. Exiting...")
             return
@@ -347,11 +330,17 @@ USAGE EXAMPLES:
    inserter = DocumentInserter()
    inserter.add_multiple_documents([...])
 
-3. Add your own documents:
+3. Create the indexes once per deployment (the API no longer does this at startup):
+   python migrate.py
+
+   Load large JSONL/CSV files non-interactively (batched, parallel, resumable):
+   python ingest.py data/commands.jsonl --workers 8
+
+4. Add your own documents:
    - Modify the CUSTOM_DOCS list in the main() function
    - Or create your own document list and pass it to add_multiple_documents()
 
-4. Document format:
+5. Document format:
    {
        "command_id": "unique_identifier",
        "command": "user query or command",
@@ -0,0 +1,249 @@
+# ingest.py
+"""
+Non-interactive, resumable bulk loader for the System Chatbot knowledge base
+
+Streams records from JSONL or CSV files (command_id, command, response, category), validates
+them in batches and writes each batch as chunked unordered bulk inserts from a pool of worker
+threads. Progress (records done and the byte offset they end at) is checkpointed after every
+batch that completes in order, so an interrupted load seeks back to where it stopped; re-sent
+records that already exist are counted as duplicates, not failures. Embeddings for semantic search are computed by the API when it loads the
+collection, so nothing is embedded here.
+
+Run from the app directory:
+   python ingest.py data/commands.jsonl
+   python ingest.py data/commands.csv --batch-size 5000 --workers 8 --errors rejected.jsonl
+   python ingest.py data/commands.jsonl --restart      # ignore an existing checkpoint
+   python ingest.py data/commands.jsonl --sync         # nightly sync: insert new, update changed, skip unchanged
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from config.config import Config
+from database.database_manager import DatabaseManager
+from observability.logging_config import configure_logging
+from services.feature_1.feature_1_schema import SystemInfoCreate
+
+logger = logging.getLogger("ingest")
+
+DUPLICATE_REASON = "Command ID already exists"
+COUNTERS = ("inserted", "updated", "unchanged", "duplicates", "rejected")
+
+def read_records(path: str, file_format: Optional[str] = None, start: int = 0) -> Iterator[Tuple[Dict, int]]:
+    """Yield (record, end) pairs from a JSONL or CSV file, end being the byte offset just past the record.
+
+    start is an end offset yielded by an earlier run: reading seeks straight to it instead of
+    re-parsing the records before it.
+    """
+    file_format = file_format or ("csv" if path.lower().endswith(".csv") else "jsonl")
+    with open(path, "rb") as f:
+        position = 0
+
+        def lines() -> Iterator[str]:
+            # csv.reader pulls one line at a time, so position is the end of the record it last returned
+            nonlocal position
+            for line in iter(f.readline, b""):
+                position += len(line)
+                yield line.decode("utf-8")
+
+        if file_format == "csv":
+            reader = csv.DictReader(lines())
+            # The header is always read from the top of the file
+            if reader.fieldnames is not None and start > position:
+                f.seek(start)
+                position = start
+            for record in reader:
+                yield record, position
+            return
+        f.seek(start)
+        position = start
+        for line in lines():
+            if not line.strip():
+                continue
+            line_start = position - len(line.encode("utf-8"))
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield {"_error": f"Line at byte {line_start}: invalid JSON ({e.msg})"}, position
+                continue
+            if not isinstance(record, dict):
+                record = {"_error": f"Line at byte {line_start}: not a JSON object"}
+            yield record, position
+
+def batched(records: Iterator[Tuple[Dict, int]], size: int, offset: int = 0) -> Iterator[Tuple[int, List[Dict], int]]:
+    """Group (record, end) pairs into (offset, batch, end) triples, counting records from offset"""
+    batch, end = [], 0
+    for record, end in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield offset, batch, end
+            offset += len(batch)
+            batch = []
+    if batch:
+        yield offset, batch, end
+
+def validate_batch(batch: List[Dict], offset: int) -> Tuple[List[Dict], List[int], List[Dict]]:
+    """Split a batch into insertable documents (with their source positions) and rejected records"""
+    documents, positions, rejected = [], [], []
+    for index, record in enumerate(batch):
+        if "_error" in record:
+            rejected.append({"index": offset + index, "command_id": "unknown", "reason": record["_error"]})
+            continue
+        try:
+            item = SystemInfoCreate(**record)
+        except ValidationError as e:
+            reason = "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors())
+            rejected.append({"index": offset + index, "command_id": record.get("command_id", "unknown"), "reason": reason})
+            continue
+        documents.append(item.model_dump())
+        positions.append(offset + index)
+    return documents, positions, rejected
+
+class Checkpoint:
+    """Records how many source records are safely written and the byte offset they end at, in a JSON file next to the source"""
+
+    def __init__(self, path: str, source: str):
+        self.path = path
+        self.source = os.path.abspath(source)
+        self.state = dict({"source": self.source, "records_done": 0, "byte_offset": 0},
+                          **{counter: 0 for counter in COUNTERS})
+
+    def load(self) -> Tuple[int, int]:
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                state = json.load(f)
+            if state.get("source") != self.source:
+                raise ValueError(f"Checkpoint {self.path} belongs to {state.get('source')}; use --restart or --checkpoint")
+            if state.get("records_done") and "byte_offset" not in state:
+                raise ValueError(f"Checkpoint {self.path} has no byte offset to resume from; use --restart")
+            self.state.update(state)
+        return self.state["records_done"], self.state["byte_offset"]
+
+    def save(self, records_done: int, byte_offset: int, counts: Dict[str, int]):
+        self.state["records_done"] = records_done
+        self.state["byte_offset"] = byte_offset
+        for counter, value in counts.items():
+            self.state[counter] = self.state.get(counter, 0) + value
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(self.state, f)
+        # Atomic on POSIX and Windows, so a crash never leaves a half-written checkpoint
+        os.replace(temporary, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+def ingest(args) -> Dict:
+    db_manager = DatabaseManager()
+    # Duplicate detection relies on the unique command_id index; a no-op once migrate.py has run
+    db_manager.create_indexes()
+    checkpoint = Checkpoint(args.checkpoint or args.source + ".checkpoint.json", args.source)
+    if args.restart:
+        checkpoint.remove()
+    start, byte_offset = checkpoint.load()
+    if start:
+        logger.info("Resuming after %d records already ingested (byte %d)", start, byte_offset)
+
+    errors_file = open(args.errors, "a", encoding="utf-8") if args.errors else None
+    # Batches finish out of order; the checkpoint only advances over a contiguous prefix of them
+    completed: Dict[int, Tuple[int, int, Dict[str, int]]] = {}
+    next_offset = start
+    totals = {counter: 0 for counter in COUNTERS}
+    started = time.perf_counter()
+
+    def write_batch(offset: int, batch: List[Dict], end: int) -> Tuple[int, int, int, Dict[str, int], List[Dict]]:
+        documents, positions, rejected = validate_batch(batch, offset)
+        counts = {counter: 0 for counter in COUNTERS}
+        if documents:
+            if args.sync:
+                # Upsert by content hash: unchanged records cost a read, not a write
+                result = db_manager.sync_system_info(documents, chunk_size=args.chunk_size)
+                counts["updated"] = result["updated_count"]
+                counts["unchanged"] = result["unchanged_count"]
+            else:
+                result = db_manager.bulk_insert_system_info(documents, chunk_size=args.chunk_size)
+            counts["inserted"] = result.get("inserted_count", 0)
+            for item in result.get("failed_items", []):
+                if item["reason"] == DUPLICATE_REASON:
+                    counts["duplicates"] += 1
+                else:
+                    rejected.append(dict(item, index=positions[item["index"]]))
+        counts["rejected"] = len(rejected)
+        return offset, len(batch), end, counts, rejected
+
+    def collect(futures) -> None:
+        nonlocal next_offset
+        for future in futures:
+            offset, size, end, counts, rejected = future.result()
+            completed[offset] = (size, end, counts)
+            for counter, value in counts.items():
+                totals[counter] += value
+            if errors_file:
+                for item in rejected:
+                    errors_file.write(json.dumps(item) + "\n")
+        while next_offset in completed:
+            size, end, counts = completed.pop(next_offset)
+            next_offset += size
+            checkpoint.save(next_offset, end, counts)
+        elapsed = time.perf_counter() - started
+        logger.info("%d records done, %d inserted (%.0f docs/s)", next_offset, totals["inserted"],
+                    totals["inserted"] / elapsed if elapsed else 0.0)
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            pending = set()
+            for offset, batch, end in batched(read_records(args.source, args.format, byte_offset), args.batch_size, start):
+                pending.add(pool.submit(write_batch, offset, batch, end))
+                # Bound the number of batches held in memory
+                if len(pending) >= args.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(done)
+            done, _ = wait(pending)
+            collect(done)
+    finally:
+        if errors_file:
+            errors_file.close()
+
+    elapsed = time.perf_counter() - started
+    summary = dict(totals, records_done=next_offset, elapsed_s=round(elapsed, 3),
+                   docs_per_second=round(totals["inserted"] / elapsed, 1) if elapsed else 0.0)
+    if not args.keep_checkpoint:
+        checkpoint.remove()
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk load system information from JSONL or CSV")
+    parser.add_argument("source", help="Path to a .jsonl or .csv file")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="Override detection by file extension")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Records validated and written per worker task")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Documents per insert_many (default BULK_CHUNK_SIZE)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent writer threads")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default <source>.checkpoint.json)")
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint and start over")
+    parser.add_argument("--keep-checkpoint", action="store_true", help="Keep the checkpoint file after a complete run")
+    parser.add_argument("--errors", default=None, help="Append rejected records to this JSONL file")
+    parser.add_argument("--sync", action="store_true",
+                        help="Upsert instead of insert: update changed records and skip unchanged ones by content hash")
+    args = parser.parse_args()
+
+    config = Config()
+    configure_logging(config.LOG_LEVEL, config.LOG_FORMAT)
+    try:
+        summary = ingest(args)
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; rerun the same command to resume from the checkpoint")
+        sys.exit(130)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
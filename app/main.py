@@ -1,28 +1,146 @@
 # main.py (CHANGED - updated description and version)
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse
+from config.config import Config
+from observability.logging_config import configure_logging
+
+config = Config()
+configure_logging(config.LOG_LEVEL, config.LOG_FORMAT)
+
+from services.feature_1.feature_1 import ChatbotService
 from services.feature_1.feature_1_router import router as chatbot_router
 from database.database_connection import DatabaseConnection
+from database.async_database_connection import AsyncDatabaseConnection
+from database.async_database_manager import AsyncDatabaseManager
+from database.pool_monitor import pool_stats
+from observability.metrics import registry
+from observability.middleware import MetricsMiddleware
+
+logger = logging.getLogger(__name__)
+
+async def prepare(app: FastAPI, chatbot_service, tasks: list):
+    """Build the search indexes, then warm the caches; /ready answers 503 until both are done"""
+    started = time.perf_counter()
+    try:
+        await chatbot_service.load_indexes_async()
+        logger.info("Search indexes loaded in %.1f ms", (time.perf_counter() - started) * 1000)
+    except Exception as e:
+        # MongoDB keeps answering searches; the change-log poller retries the load
+        logger.error("Index load error: %s", e)
+    # Each worker process has its own caches and indexes; polling the change log keeps them
+    # within COHERENCE_POLL_INTERVAL seconds of writes made by the other workers
+    if config.COHERENCE_POLL_INTERVAL > 0:
+        tasks.append(asyncio.create_task(chatbot_service.run_change_log_poller(config.COHERENCE_POLL_INTERVAL)))
+    if config.WARMUP_ENABLED:
+        await warm_up(app, chatbot_service)
+    else:
+        app.state.warm_up = {"complete": False, "skipped": True}
+
+async def warm_up(app: FastAPI, chatbot_service):
+    """Preload the shared hot set, then mark the worker ready (also when the budget runs out)"""
+    try:
+        app.state.warm_up = await chatbot_service.warm_up_async(config.WARMUP_TIME_BUDGET)
+        logger.info("Warm-up finished: %s", app.state.warm_up)
+    except Exception as e:
+        # A worker with cold caches still serves correctly, so readiness is not withheld
+        logger.error("Warm-up error: %s", e)
+        app.state.warm_up = {"complete": False, "error": str(e)}
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    app.state.warm_up = None
+    if config.AUTO_MIGRATE:
+        await AsyncDatabaseManager().create_indexes()
+    # Built once, before the first request; constructing it does no I/O
+    chatbot_service = app.state.chatbot_service = ChatbotService()
+    tasks = []
+    if config.HOT_SET_FLUSH_INTERVAL > 0:
+        tasks.append(asyncio.create_task(chatbot_service.run_hot_set_flusher(config.HOT_SET_FLUSH_INTERVAL)))
+    # Index load, change-log polling and warm-up run in the background: the worker accepts traffic
+    # at once, served from MongoDB, and reports ready via /ready
+    tasks.append(asyncio.create_task(prepare(app, chatbot_service, tasks)))
+    logger.info("Startup complete in %.1f ms", (time.perf_counter() - started) * 1000)
+    yield
+    for task in tasks:
+        task.cancel()
+    # A poll or flush cancelled mid-request must finish unwinding before its client is closed
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if chatbot_service.insert_coalescer is not None:
+        await chatbot_service.insert_coalescer.drain()
+    if config.HOT_SET_FLUSH_INTERVAL > 0:
+        try:
+            await chatbot_service.flush_hot_set_async()
+        except Exception as e:
+            logger.error("Hot set flush error: %s", e)
+    DatabaseConnection.close_connection()
+    await AsyncDatabaseConnection.close_connection()
+    # The service holds the closed clients; a later startup in this process builds a new one
+    app.state.chatbot_service = None
 
 app = FastAPI(
     title="System Chatbot API",
     description="A keyword search-based chatbot for system information with CRUD operations",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(chatbot_router)
 
+def _cache_metrics():
+    chatbot_service = getattr(app.state, "chatbot_service", None)
+    if chatbot_service is None:
+        return {}
+    caches = {"search": chatbot_service.search_cache, "document": chatbot_service.document_cache}
+    stats = {name: cache.stats() for name, cache in caches.items()}
+    return {
+        f"chatbot_cache_{counter}": (f"Cache {counter}", ("cache",),
+                                     {(name, ): values[counter] for name, values in stats.items()})
+        for counter in ("hits", "misses", "evictions", "size")
+    }
+
+def _pool_metrics():
+    stats = pool_stats()
+    return {
+        f"mongodb_pool_{counter}": (f"Connection pool {counter.replace('_', ' ')}", ("client", "address"),
+                                    {(client, address): values[counter]
+                                     for client, pools in stats.items() for address, values in pools.items()})
+        for counter in ("checked_out", "open_connections", "checkout_failures", "pool_cleared")
+    }
+
+registry.register_collector(_cache_metrics)
+registry.register_collector(_pool_metrics)
+
 @app.get("/")
 async def root():
     return {"message": "System Chatbot API v1.0 is running with keyword search"}
 
 @app.get("/health")
 async def health_check():
+    try:
+        await AsyncDatabaseConnection.get_database().command("ping")
+    except Exception as e:
+        return JSONResponse(status_code=503, content={"status": "unhealthy", "message": f"Database unreachable: {e}"})
     return {"status": "healthy", "message": "API is operational"}
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    DatabaseConnection.close_connection()
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 503 until the search indexes are built and the caches hold the hot set (or the warm-up budget is spent)"""
+    if app.state.warm_up is None:
+        return JSONResponse(status_code=503, content={"status": "warming_up", "message": "Loading search indexes and warming caches"})
+    return {"status": "ready", "indexes_loaded": app.state.chatbot_service.indexes_loaded, "warm_up": app.state.warm_up}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus exposition of request/DB latency histograms, cache and pool gauges"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     import uvicorn
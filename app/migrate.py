@@ -0,0 +1,48 @@
+# migrate.py
+"""
+One-time schema setup for the System Chatbot collection
+
+Creates the MongoDB indexes the API and the loaders rely on: the unique command_id index (which
+is what turns re-sent records into duplicates), category, the text index used by
+SEARCH_BACKEND=mongo, and the hot-set indexes read by the startup warm-up (with a TTL that
+expires entries unseen for HOT_SET_WINDOW). API workers no longer do this on every start;
+run it once per deployment, before the first start and after upgrades. Safe to re-run.
+
+Run from the app directory:
+   python migrate.py
+"""
+
+import json
+import logging
+import sys
+import time
+
+from config.config import Config
+from database.database_manager import DatabaseManager
+from observability.logging_config import configure_logging
+
+logger = logging.getLogger("migrate")
+
+def migrate() -> dict:
+    config = Config()
+    started = time.perf_counter()
+    indexes = DatabaseManager().create_indexes()
+    return {
+        "database": config.DATABASE_NAME,
+        "collection": config.COLLECTION_NAME,
+        "indexes": indexes,
+        "elapsed_s": round(time.perf_counter() - started, 3)
+    }
+
+def main():
+    config = Config()
+    configure_logging(config.LOG_LEVEL, config.LOG_FORMAT)
+    try:
+        summary = migrate()
+    except Exception as e:
+        logger.error("Migration failed: %s", e)
+        sys.exit(1)
+    print(json.dumps(summary, indent=2))
+
+if __name__ == "__main__":
+    main()
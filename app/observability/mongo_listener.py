@@ -0,0 +1,46 @@
+# app/observability/mongo_listener.py
+import threading
+from pymongo import monitoring
+from observability.metrics import mongodb_command_duration, mongodb_command_failures
+
+# Wire-protocol command names mapped to the operation labels we report
+_OPERATIONS = {
+    "find": "find",
+    "getMore": "find",
+    "insert": "insert",
+    "update": "update",
+    "delete": "delete",
+    "findAndModify": "find_and_modify",
+    "aggregate": "aggregate",
+    "count": "count"
+}
+
+class CommandTimingListener(monitoring.CommandListener):
+    """Times every MongoDB command; find commands carrying $text are reported as text_search"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._text_searches = set()
+
+    def started(self, event):
+        if event.command_name == "find" and "$text" in event.command.get("filter", {}):
+            with self._lock:
+                self._text_searches.add(event.request_id)
+
+    def _operation(self, event) -> str:
+        if event.command_name == "find" and self._text_searches:
+            with self._lock:
+                if event.request_id in self._text_searches:
+                    self._text_searches.discard(event.request_id)
+                    return "text_search"
+        return _OPERATIONS.get(event.command_name, "other")
+
+    def succeeded(self, event):
+        mongodb_command_duration.observe(event.duration_micros / 1e6, self._operation(event))
+
+    def failed(self, event):
+        operation = self._operation(event)
+        mongodb_command_duration.observe(event.duration_micros / 1e6, operation)
+        mongodb_command_failures.inc(operation)
+
+command_listener = CommandTimingListener()
\ No newline at end of file
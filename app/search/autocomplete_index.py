@@ -0,0 +1,120 @@
+# app/search/autocomplete_index.py
+import heapq
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List
+
+from search.exact_match_index import normalize_command
+
+class AutocompleteIndex:
+    """Sorted-array prefix index over distinct normalized command texts, ranked by popularity
+
+    All completions of a prefix sit in one contiguous slice of the sorted array, found with two
+    binary searches. Popular completions are picked from whichever is smaller, the slice or the
+    set of texts that have been served at least once (bounded by scan_limit), and the rest of
+    the answer is filled alphabetically from the start of the slice, so a lookup never walks
+    the whole slice.
+    """
+
+    def __init__(self, scan_limit: int = 5000):
+        self.scan_limit = scan_limit
+        self._sorted_keys: List[str] = []
+        self._members: Dict[str, Dict[str, str]] = {}
+        self._keys: Dict[str, str] = {}
+        self._popularity: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._sorted_keys)
+
+    def add_document(self, document: Dict):
+        """Index a document's command, replacing any previous version with the same command_id"""
+        command_id = document["command_id"]
+        command = str(document.get("command", ""))
+        key = normalize_command(command)
+        with self._lock:
+            self._remove(command_id)
+            if not key:
+                return
+            members = self._members.get(key)
+            if members is None:
+                members = self._members[key] = {}
+                insort(self._sorted_keys, key)
+            members[command_id] = command
+            self._keys[command_id] = key
+
+    def add_documents(self, documents: List[Dict]):
+        with self._lock:
+            if self._sorted_keys:
+                for document in documents:
+                    self.add_document(document)
+                return
+            # Bulk load: one sort instead of an insort per document
+            for document in documents:
+                command = str(document.get("command", ""))
+                key = normalize_command(command)
+                if key:
+                    self._members.setdefault(key, {})[document["command_id"]] = command
+                    self._keys[document["command_id"]] = key
+            self._sorted_keys = sorted(self._members)
+
+    def remove_document(self, command_id: str):
+        with self._lock:
+            self._remove(command_id)
+
+    def _remove(self, command_id: str):
+        key = self._keys.pop(command_id, None)
+        if key is None:
+            return
+        members = self._members[key]
+        members.pop(command_id, None)
+        if not members:
+            del self._members[key]
+            self._popularity.pop(key, None)
+            position = bisect_left(self._sorted_keys, key)
+            if position < len(self._sorted_keys) and self._sorted_keys[position] == key:
+                del self._sorted_keys[position]
+
+    def clear(self):
+        with self._lock:
+            self._sorted_keys.clear()
+            self._members.clear()
+            self._keys.clear()
+            self._popularity.clear()
+
+    def record_hit(self, command_id: str, count: int = 1):
+        """Count one more time an entry was served to a user"""
+        with self._lock:
+            key = self._keys.get(command_id)
+            if key is not None:
+                self._popularity[key] = self._popularity.get(key, 0) + count
+
+    def _suggestion(self, key: str) -> Dict:
+        command_id = min(self._members[key])
+        return {"command_id": command_id, "command": self._members[key][command_id], "popularity": self._popularity.get(key, 0)}
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Dict]:
+        """Up to limit distinct commands starting with prefix, most popular first, then alphabetical"""
+        normalized = normalize_command(prefix)
+        if not normalized:
+            return []
+        # Keep a trailing space typed by the user so "restart " does not match "restarting"
+        if prefix[-1:].isspace():
+            normalized += " "
+        with self._lock:
+            keys, popularity = self._sorted_keys, self._popularity
+            start = bisect_left(keys, normalized)
+            end = bisect_left(keys, normalized + "\uffff", start)
+            if len(popularity) < end - start:
+                popular = [key for key in popularity if key.startswith(normalized)]
+            else:
+                popular = [key for key in keys[start:min(end, start + self.scan_limit)] if key in popularity]
+            chosen = heapq.nsmallest(limit, popular, key=lambda key: (-popularity[key], key))
+            if len(chosen) < limit:
+                taken = set(chosen)
+                for key in keys[start:min(end, start + limit + len(taken))]:
+                    if key not in taken:
+                        chosen.append(key)
+                        if len(chosen) == limit:
+                            break
+            return [self._suggestion(key) for key in chosen]
@@ -0,0 +1,115 @@
+# app/search/bm25_index.py
+import heapq
+import math
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Common English words that carry no meaning for keyword search (MongoDB's text index drops these too)
+STOP_WORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "by", "do", "for", "from", "how", "i", "in",
+    "is", "it", "my", "of", "on", "or", "the", "to", "use", "what", "with"
+})
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stop words removed"""
+    return [token for token in _TOKEN_RE.findall(str(text).lower()) if token not in STOP_WORDS]
+
+class BM25Index:
+    """In-memory inverted index over command/response/category scored with Okapi BM25"""
+
+    FIELDS = ("command", "response", "category")
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._documents: Dict[str, Dict] = {}
+        self._total_length = 0
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _terms(self, document: Dict) -> Counter:
+        terms = Counter()
+        for field in self.FIELDS:
+            terms.update(tokenize(document.get(field, "")))
+        return terms
+
+    def add_document(self, document: Dict):
+        """Index a document, replacing any previous version with the same command_id"""
+        command_id = document["command_id"]
+        stored = {k: v for k, v in document.items() if k != "_id"}
+        terms = self._terms(stored)
+        with self._lock:
+            self._remove(command_id)
+            for term, frequency in terms.items():
+                self._postings.setdefault(term, {})[command_id] = frequency
+            length = sum(terms.values())
+            self._doc_lengths[command_id] = length
+            self._total_length += length
+            self._documents[command_id] = stored
+
+    def add_documents(self, documents: List[Dict]):
+        for document in documents:
+            self.add_document(document)
+
+    def remove_document(self, command_id: str):
+        with self._lock:
+            self._remove(command_id)
+
+    def _remove(self, command_id: str):
+        previous = self._documents.pop(command_id, None)
+        if previous is None:
+            return
+        for term in self._terms(previous):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(command_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(command_id, 0)
+
+    def get_document(self, command_id: str) -> Optional[Dict]:
+        document = self._documents.get(command_id)
+        return dict(document) if document is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._doc_lengths.clear()
+            self._documents.clear()
+            self._total_length = 0
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """Return matching documents ordered by BM25 score, each with a 'score' field"""
+        terms = set(tokenize(query))
+        with self._lock:
+            total_docs = len(self._documents)
+            if not terms or not total_docs:
+                return []
+            average_length = self._total_length / total_docs or 1.0
+            # Length normalisation k1 * (1 - b + b * len / avg) split into a constant and a per-token factor
+            norm_base = self.k1 * (1 - self.b)
+            norm_per_token = self.k1 * self.b / average_length
+            doc_lengths = self._doc_lengths
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                weight = idf * (self.k1 + 1)
+                for command_id, frequency in postings.items():
+                    norm = norm_base + norm_per_token * doc_lengths[command_id]
+                    scores[command_id] = scores.get(command_id, 0.0) + weight * frequency / (frequency + norm)
+            if limit:
+                ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            else:
+                ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+            return [dict(self._documents[command_id], score=score) for command_id, score in ranked]
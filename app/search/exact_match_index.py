@@ -0,0 +1,65 @@
+# app/search/exact_match_index.py
+import re
+import threading
+from typing import Dict, List, Optional
+
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+def normalize_command(text: str) -> str:
+    """Case-folded command text with punctuation and runs of whitespace collapsed to single spaces"""
+    return " ".join(_NON_WORD_RE.sub(" ", str(text).casefold()).split())
+
+class ExactMatchIndex:
+    """Hash map from normalized command text to the stored entries, for O(1) answers to verbatim questions"""
+
+    def __init__(self):
+        self._by_command: Dict[str, Dict[str, Dict]] = {}
+        self._keys: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add_document(self, document: Dict):
+        """Index a document, replacing any previous version with the same command_id"""
+        command_id = document["command_id"]
+        stored = {k: v for k, v in document.items() if k != "_id"}
+        key = normalize_command(stored.get("command", ""))
+        with self._lock:
+            self._remove(command_id)
+            if not key:
+                return
+            self._by_command.setdefault(key, {})[command_id] = stored
+            self._keys[command_id] = key
+
+    def add_documents(self, documents: List[Dict]):
+        for document in documents:
+            self.add_document(document)
+
+    def remove_document(self, command_id: str):
+        with self._lock:
+            self._remove(command_id)
+
+    def _remove(self, command_id: str):
+        key = self._keys.pop(command_id, None)
+        if key is None:
+            return
+        entries = self._by_command.get(key)
+        if entries is not None:
+            entries.pop(command_id, None)
+            if not entries:
+                del self._by_command[key]
+
+    def clear(self):
+        with self._lock:
+            self._by_command.clear()
+            self._keys.clear()
+
+    def lookup(self, query: str, limit: Optional[int] = None) -> List[Dict]:
+        """Entries whose command equals the query after normalization, each with a 'score' of 1.0"""
+        entries = self._by_command.get(normalize_command(query))
+        if not entries:
+            return []
+        with self._lock:
+            matches = [dict(document, score=1.0) for document in entries.values()]
+        return matches[:limit] if limit else matches
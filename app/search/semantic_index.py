@@ -0,0 +1,193 @@
+# app/search/semantic_index.py
+import math
+import threading
+import zlib
+from collections import Counter
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:  # semantic search is optional; the service disables it when numpy is missing
+    np = None
+
+from search.bm25_index import tokenize
+
+class HashingEmbedder:
+    """Offline embedder: sublinear term frequencies of words and word bigrams hashed into a fixed number of dimensions
+
+    Vectors are L2-normalised. The index applies IDF weights to the query at search time, so
+    stored rows never need recomputing when document frequencies change.
+    """
+
+    weight_by_idf = True
+
+    def __init__(self, dimensions: int = 1024):
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> Counter:
+        tokens = tokenize(text)
+        return Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self._features(text).items():
+                digest = zlib.crc32(feature.encode("utf-8"))
+                # The top hash bit picks a sign so colliding features tend to cancel rather than add up
+                sign = 1.0 if digest & 0x80000000 else -1.0
+                vectors[row, digest % self.dimensions] += sign * (1.0 + math.log(count))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+class SentenceTransformerEmbedder:
+    """Dense embeddings from a sentence-transformers model (requires the sentence-transformers package)"""
+
+    weight_by_idf = False
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.dimensions = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, texts: List[str]) -> "np.ndarray":
+        return self.model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+def build_embedder(name: str, dimensions: int = 1024, model_name: Optional[str] = None):
+    """Embedder for SEMANTIC_EMBEDDER: "hashing" (offline) or "sentence-transformers" """
+    if name == "hashing":
+        return HashingEmbedder(dimensions)
+    if name == "sentence-transformers":
+        return SentenceTransformerEmbedder(model_name)
+    raise ValueError(f"Unknown semantic embedder: {name}")
+
+class SemanticIndex:
+    """Document embeddings kept in one contiguous NumPy matrix and scored with a single matrix-vector product
+
+    Rows are added, replaced and removed in place (a removed row is filled with the last one),
+    so CRUD keeps the matrix current without rebuilding it. With quantize=True rows are stored
+    as int8, a quarter of the float32 footprint, at a small cost in score precision.
+    """
+
+    def __init__(self, embedder, fields: Iterable[str] = ("command", "response"),
+                 quantize: bool = False, min_score: float = 0.05):
+        if np is None:
+            raise ImportError("numpy is required for semantic search")
+        self.embedder = embedder
+        self.fields = tuple(fields)
+        self.quantize = quantize
+        self.min_score = min_score
+        self._dtype = np.int8 if quantize else np.float32
+        self._matrix = np.zeros((0, embedder.dimensions), dtype=self._dtype)
+        self._size = 0
+        self._row_ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._documents: Dict[str, Dict] = {}
+        # Rows with a non-zero weight per dimension, for the query-side IDF of sparse embedders
+        self._document_frequency = np.zeros(embedder.dimensions, dtype=np.int64)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _text(self, document: Dict) -> str:
+        return " ".join(str(document.get(field, "")) for field in self.fields)
+
+    def _encode(self, vectors: "np.ndarray") -> "np.ndarray":
+        if self.quantize:
+            return np.clip(np.rint(vectors * 127.0), -127, 127).astype(np.int8)
+        return vectors
+
+    def _reserve(self, rows: int):
+        if rows <= len(self._matrix):
+            return
+        capacity = max(rows, 2 * len(self._matrix), 64)
+        matrix = np.zeros((capacity, self.embedder.dimensions), dtype=self._dtype)
+        matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+
+    def add_document(self, document: Dict):
+        """Index a document, replacing any previous version with the same command_id"""
+        self.add_documents([document])
+
+    def add_documents(self, documents: List[Dict]):
+        """Embed a batch of documents in one call and write their rows"""
+        # Later versions of a command_id within the batch win
+        latest = {document["command_id"]: document for document in documents}
+        if not latest:
+            return
+        stored = [{k: v for k, v in document.items() if k != "_id"} for document in latest.values()]
+        vectors = self._encode(self.embedder.embed([self._text(document) for document in stored]))
+        with self._lock:
+            for document, vector in zip(stored, vectors):
+                command_id = document["command_id"]
+                row = self._rows.get(command_id)
+                if row is None:
+                    self._reserve(self._size + 1)
+                    row = self._size
+                    self._size += 1
+                    self._row_ids.append(command_id)
+                    self._rows[command_id] = row
+                else:
+                    self._document_frequency -= self._matrix[row] != 0
+                self._matrix[row] = vector
+                self._document_frequency += vector != 0
+                self._documents[command_id] = document
+
+    def remove_document(self, command_id: str):
+        with self._lock:
+            row = self._rows.pop(command_id, None)
+            if row is None:
+                return
+            self._document_frequency -= self._matrix[row] != 0
+            del self._documents[command_id]
+            last = self._size - 1
+            if row != last:
+                moved_id = self._row_ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._row_ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._matrix[last] = 0
+            self._row_ids.pop()
+            self._size = last
+
+    def get_document(self, command_id: str) -> Optional[Dict]:
+        document = self._documents.get(command_id)
+        return dict(document) if document is not None else None
+
+    def clear(self):
+        with self._lock:
+            self._matrix = np.zeros((0, self.embedder.dimensions), dtype=self._dtype)
+            self._size = 0
+            self._row_ids.clear()
+            self._rows.clear()
+            self._documents.clear()
+            self._document_frequency[:] = 0
+
+    def _query_vector(self, query: str) -> "np.ndarray":
+        vector = self.embedder.embed([query])[0]
+        if self.embedder.weight_by_idf:
+            vector = vector * (np.log((self._size + 1) / (self._document_frequency + 1)) + 1.0)
+            vector /= max(float(np.linalg.norm(vector)), 1e-12)
+        if self.quantize:
+            vector = vector / 127.0
+        return vector.astype(np.float32)
+
+    def search(self, query: str, limit: Optional[int] = None, min_score: Optional[float] = None) -> List[Dict]:
+        """Return documents ordered by cosine similarity to the query, each with a 'score' field"""
+        threshold = self.min_score if min_score is None else min_score
+        with self._lock:
+            if not self._size:
+                return []
+            query_vector = self._query_vector(query)
+            if not query_vector.any():
+                return []
+            scores = self._matrix[:self._size] @ query_vector
+            if limit and limit < self._size:
+                top = np.argpartition(scores, -limit)[-limit:]
+                top = top[np.argsort(scores[top])[::-1]]
+            else:
+                top = np.argsort(scores)[::-1]
+            return [
+                dict(self._documents[self._row_ids[row]], score=round(float(scores[row]), 4))
+                for row in top if scores[row] >= threshold
+            ]
@@ -0,0 +1,123 @@
+# app/search/trigram_index.py
+import heapq
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set
+
+from search.bm25_index import tokenize
+
+def word_trigrams(token: str) -> Set[str]:
+    """Character trigrams of one word, padded like pg_trgm ("  w", " wo", "wor", "ord", "rd ")"""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance between two words"""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+def word_similarity(a: str, b: str) -> float:
+    """1.0 for identical words, falling towards 0.0 as the edit distance approaches the word length"""
+    longest = max(len(a), len(b))
+    return 1.0 - edit_distance(a, b) / longest if longest else 1.0
+
+class TrigramIndex:
+    """In-memory character-trigram index for typo-tolerant search over command (and optionally response)
+
+    Candidates are the documents sharing the most trigrams with the query; only those are
+    re-ranked by per-word edit distance, so a misspelled query never scans the whole corpus.
+    """
+
+    def __init__(self, fields: Iterable[str] = ("command",), min_similarity: float = 0.3, candidate_factor: int = 5):
+        self.fields = tuple(fields)
+        self.min_similarity = min_similarity
+        self.candidate_factor = candidate_factor
+        self._postings: Dict[str, Set[str]] = {}
+        self._words: Dict[str, Set[str]] = {}
+        self._documents: Dict[str, Dict] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def _document_words(self, document: Dict) -> Set[str]:
+        words = set()
+        for field in self.fields:
+            words.update(tokenize(document.get(field, "")))
+        return words
+
+    def add_document(self, document: Dict):
+        """Index a document, replacing any previous version with the same command_id"""
+        command_id = document["command_id"]
+        stored = {k: v for k, v in document.items() if k != "_id"}
+        words = self._document_words(stored)
+        with self._lock:
+            self._remove(command_id)
+            for word in words:
+                for gram in word_trigrams(word):
+                    self._postings.setdefault(gram, set()).add(command_id)
+            self._words[command_id] = words
+            self._documents[command_id] = stored
+
+    def add_documents(self, documents: List[Dict]):
+        for document in documents:
+            self.add_document(document)
+
+    def remove_document(self, command_id: str):
+        with self._lock:
+            self._remove(command_id)
+
+    def _remove(self, command_id: str):
+        if self._documents.pop(command_id, None) is None:
+            return
+        for word in self._words.pop(command_id, ()):
+            for gram in word_trigrams(word):
+                postings = self._postings.get(gram)
+                if postings is not None:
+                    postings.discard(command_id)
+                    if not postings:
+                        del self._postings[gram]
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._words.clear()
+            self._documents.clear()
+
+    def _rank(self, query_words: List[str], words: Set[str]) -> float:
+        # Each query word is matched against its closest word in the document
+        return sum(max(word_similarity(query_word, word) for word in words) for query_word in query_words) / len(query_words)
+
+    def search(self, query: str, limit: Optional[int] = None, min_similarity: Optional[float] = None) -> List[Dict]:
+        """Return documents resembling the query ordered by similarity, each with a 'score' field"""
+        query_words = list(dict.fromkeys(tokenize(query)))
+        if not query_words:
+            return []
+        threshold = self.min_similarity if min_similarity is None else min_similarity
+        query_grams = set().union(*(word_trigrams(word) for word in query_words))
+        with self._lock:
+            overlap = Counter()
+            for gram in query_grams:
+                overlap.update(self._postings.get(gram, ()))
+            # Share of the query's trigrams found in the document, as in pg_trgm's word_similarity
+            min_overlap = threshold * len(query_grams)
+            candidates = [(command_id, count) for command_id, count in overlap.items() if count >= min_overlap]
+            if limit:
+                candidates = heapq.nlargest(limit * self.candidate_factor, candidates, key=lambda item: item[1])
+
+            scored = []
+            for command_id, count in candidates:
+                score = self._rank(query_words, self._words[command_id])
+                if score >= threshold:
+                    scored.append((score, count, command_id))
+            scored.sort(reverse=True)
+            if limit:
+                scored = scored[:limit]
+            return [dict(self._documents[command_id], score=round(score, 4)) for score, _, command_id in scored]
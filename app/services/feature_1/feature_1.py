@@ -1,82 +1,558 @@
 # services/feature_1/feature_1.py (FIXED ChatbotService)
-from typing import List, Dict, Optional
-from database.database_manager import DatabaseManager  # Adjusted to relative import
+import asyncio
+import logging
+from typing import List, Dict, Optional, Tuple, AsyncIterator
+from database.database_manager import DatabaseManager, WORKER_ID, pending_changes  # Adjusted to relative import
+from database.async_database_manager import AsyncDatabaseManager
+from database.write_coalescer import WriteCoalescer
 from config.config import Config  # Adjust import path
+from search.bm25_index import BM25Index
+from search.exact_match_index import ExactMatchIndex
+from search.autocomplete_index import AutocompleteIndex
+from search.trigram_index import TrigramIndex
+from search.semantic_index import SemanticIndex, build_embedder
+from cache.ttl_lru_cache import TTLLRUCache
+from cache.hot_set import HotSetTracker
+from cache.single_flight import SingleFlight
+from pydantic import TypeAdapter, ValidationError
 from services.feature_1.feature_1_schema import (
     SystemInfoCreate, SystemInfoUpdate, SystemInfoResponse, 
-    SearchResponse, BulkInsertResponse
+    SearchResponse, BulkInsertResponse, BulkSystemInfoUpdateItem,
+    BulkUpdateResponse, BulkDeleteResponse, SyncResponse, AutocompleteResponse,
+    KeywordSearchQuery, BatchSearchResponse, SystemInfoPartial, SUMMARY_FIELDS
 )
-from datetime import datetime
+from datetime import datetime, timedelta
+import base64
+import hashlib
+import json
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+def encode_page_cursor(command_id: str) -> str:
+    """Opaque keyset-pagination token for the position after command_id"""
+    return base64.urlsafe_b64encode(command_id.encode("utf-8")).decode("ascii")
+
+def decode_page_cursor(cursor: str) -> str:
+    try:
+        command_id = base64.b64decode(cursor.encode("ascii"), altchars=b"-_", validate=True).decode("utf-8")
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid pagination cursor")
+    if not command_id:
+        raise ValueError("Invalid pagination cursor")
+    return command_id
+
+# Compiled once: validates database dicts straight into response models and serializes them in pydantic-core
+SYSTEM_INFO_LIST_ADAPTER = TypeAdapter(List[SystemInfoResponse])
+SYSTEM_INFO_PARTIAL_LIST_ADAPTER = TypeAdapter(List[SystemInfoPartial])
+
+def dump_system_info_list(items: List[SystemInfoResponse]) -> bytes:
+    if items and isinstance(items[0], SystemInfoPartial):
+        return SYSTEM_INFO_PARTIAL_LIST_ADAPTER.dump_json(items)
+    return SYSTEM_INFO_LIST_ADAPTER.dump_json(items)
+
+def resolve_fields(fields: Optional[List[str]] = None, summary: bool = False) -> Optional[List[str]]:
+    """Fields to project (command_id first), or None for full documents"""
+    selected = SUMMARY_FIELDS if summary else (fields or [])
+    if not selected:
+        return None
+    return list(dict.fromkeys(["command_id", *selected]))
+
+def _etag(*parts) -> str:
+    return '"' + hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:32] + '"'
+
+def _version_timestamp(value: Optional[datetime]) -> str:
+    # MongoDB stores milliseconds, so a freshly written document and its read-back share one ETag
+    return value.isoformat(timespec="milliseconds") if isinstance(value, datetime) else ""
+
+def document_etag(command_id: str, updated_at: Optional[datetime]) -> str:
+    """Strong ETag of one document: every write through DatabaseManager moves updated_at"""
+    return _etag("doc", command_id, _version_timestamp(updated_at))
+
+def collection_etag(change_seq: int, *params) -> str:
+    """Strong ETag of a listing: the change-log seq, which every write bumps, plus whatever shapes the response (fields, page)"""
+    return _etag("list", change_seq, *params)
+
+def update_indexes(indexes: list, docs: List[Dict], removed_ids: List[str]):
+    """Remove then (re)index documents in each index; add_documents replaces earlier versions"""
+    for index in indexes:
+        for command_id in removed_ids:
+            index.remove_document(command_id)
+        if docs:
+            index.add_documents(docs)
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def ndjson_line(doc: Dict) -> bytes:
+    return (json.dumps(doc, default=_json_default) + "\n").encode("utf-8")
 
 class ChatbotService:
     def __init__(self):
         self.config = Config()
         self.db_manager = DatabaseManager()
+        self.async_db_manager = AsyncDatabaseManager()
+        self.search_index = None
+        self.exact_index = None
+        self.autocomplete_index = None
+        self.fuzzy_index = None
+        self.semantic_index = None
+        self.search_cache = TTLLRUCache(self.config.SEARCH_CACHE_SIZE, self.config.SEARCH_CACHE_TTL)
+        # Bumped on every search invalidation; a search only caches its result if no write landed meanwhile
+        self.search_generation = 0
+        self.document_cache = TTLLRUCache(self.config.DOCUMENT_CACHE_SIZE, self.config.DOCUMENT_CACHE_TTL)
+        self.hot_set = HotSetTracker()
+        # Identical searches running at the same moment share one backend call
+        self.search_flight = SingleFlight()
+        self.insert_coalescer = (
+            WriteCoalescer(self._insert_batch_async, self.config.WRITE_COALESCING_MAX_BATCH,
+                           self.config.WRITE_COALESCING_MAX_DELAY_MS / 1000)
+            if self.config.WRITE_COALESCING_ENABLED else None
+        )
+        # Last change-log seq reflected in this worker's caches and indexes
+        self.change_seq = 0
+        # The indexes are built by load_indexes_async after startup; until then MongoDB answers searches
+        self.indexes_loaded = False
+        # Writes made while indexes are being rebuilt, replayed into the new set before it goes live
+        self._index_backlog: Optional[List[Tuple[List[Dict], List[str]]]] = None
+        self._index_lock = threading.Lock()
+        # Async writes apply their index updates one at a time, in the order their writes completed
+        self._index_order = asyncio.Lock()
+    
+    def _new_indexes(self) -> Dict[str, object]:
+        """Empty search indexes for the enabled features, keyed by the attribute that holds each"""
+        return {
+            "search_index": BM25Index() if self.config.SEARCH_BACKEND == "bm25" else None,
+            "exact_index": ExactMatchIndex() if self.config.EXACT_MATCH_ENABLED else None,
+            "autocomplete_index": (
+                AutocompleteIndex(self.config.AUTOCOMPLETE_SCAN_LIMIT) if self.config.AUTOCOMPLETE_ENABLED else None
+            ),
+            "fuzzy_index": (
+                TrigramIndex(self.config.FUZZY_FIELDS, self.config.FUZZY_MIN_SIMILARITY)
+                if self.config.FUZZY_SEARCH_ENABLED else None
+            ),
+            "semantic_index": self._build_semantic_index()
+        }
+    
+    def _build_semantic_index(self) -> Optional[SemanticIndex]:
+        if not self.config.SEMANTIC_SEARCH_ENABLED:
+            return None
+        try:
+            # A reload keeps the embedder, which may hold a loaded model
+            embedder = (
+                self.semantic_index.embedder if self.semantic_index is not None
+                else build_embedder(self.config.SEMANTIC_EMBEDDER, self.config.SEMANTIC_DIMENSIONS, self.config.MODEL_NAME)
+            )
+            return SemanticIndex(
+                embedder, self.config.SEMANTIC_FIELDS,
+                quantize=self.config.SEMANTIC_QUANTIZE, min_score=self.config.SEMANTIC_MIN_SCORE
+            )
+        except (ImportError, ValueError) as e:
+            logger.warning("Semantic search disabled: %s", e)
+            return None
+    
+    def _indexes(self) -> list:
+        indexes = (self.search_index, self.exact_index, self.autocomplete_index, self.fuzzy_index, self.semantic_index)
+        return [index for index in indexes if index is not None]
+    
+    async def load_indexes_async(self):
+        """Build the in-process search indexes from MongoDB in a worker thread and swap them in
+
+        MongoDB stays the system of record: until the swap, keyword searches use its text index and
+        the other modes fall back to it.
+        """
+        self._swap_indexes(*await asyncio.to_thread(self._build_indexes))
+    
+    def _build_indexes(self) -> Tuple[int, Dict[str, object]]:
+        """New indexes filled from MongoDB off to the side, with the change-log seq they reflect"""
+        with self._index_lock:
+            self._index_backlog = []
+        # Read before the documents: writes from other workers landing mid-load are replayed by the
+        # next change-log poll, this worker's own through the backlog
+        try:
+            change_seq = self.db_manager.get_change_log()["seq"]
+        except Exception as e:
+            # Left at 0, the first successful poll sees a gap and reloads
+            logger.error("Change log read error: %s", e)
+            change_seq = 0
+        try:
+            indexes = self._new_indexes()
+            built = [index for index in indexes.values() if index is not None]
+            if built:
+                documents = self.db_manager.get_all_system_info()
+                for index in built:
+                    index.add_documents(documents)
+                # Most of the backlog is replayed here, off the event loop; the swap applies the rest
+                for docs, removed_ids in self._take_backlog():
+                    update_indexes(built, docs, removed_ids)
+        except Exception:
+            self._take_backlog(stop=True)
+            raise
+        return change_seq, indexes
+    
+    def _take_backlog(self, stop: bool = False) -> List[Tuple[List[Dict], List[str]]]:
+        with self._index_lock:
+            backlog = self._index_backlog or []
+            self._index_backlog = None if stop else []
+        return backlog
+    
+    def _swap_indexes(self, change_seq: int, indexes: Dict[str, object]):
+        # Called on the event loop with no await in between, so searches there see the old set or the new one
+        with self._index_lock:
+            built = [index for index in indexes.values() if index is not None]
+            for docs, removed_ids in self._index_backlog or []:
+                update_indexes(built, docs, removed_ids)
+            self._index_backlog = None
+            for name, index in indexes.items():
+                setattr(self, name, index)
+        self.change_seq = change_seq
+        self.indexes_loaded = True
+        # Results cached from the old indexes while the new ones were built are dropped as well
+        self._invalidate_searches()
+    
+    def _apply_to_indexes(self, docs: List[Dict] = (), removed_ids: List[str] = ()):
+        """Apply written documents and deletions to the live indexes, and to a rebuild in progress"""
+        with self._index_lock:
+            indexes = self._indexes()
+            if self._index_backlog is not None:
+                self._index_backlog.append((list(docs), list(removed_ids)))
+        update_indexes(indexes, docs, removed_ids)
+    
+    async def _apply_to_indexes_async(self, docs: List[Dict] = (), removed_ids: List[str] = ()):
+        """_apply_to_indexes in write order, in a worker thread when the batch is large"""
+        async with self._index_order:
+            if len(docs) + len(removed_ids) < self.config.INDEX_OFFLOAD_MIN_DOCS:
+                self._apply_to_indexes(docs, removed_ids)
+                return
+            await asyncio.to_thread(self._apply_to_indexes, docs, removed_ids)
+        # Searches answered from the partly updated indexes meanwhile must not stay cached
+        self._invalidate_searches()
+    
+    # ---------- write hooks: keep in-process state in sync with MongoDB ----------
+    
+    def _invalidate_searches(self):
+        # Bumped before clearing, so a search caching concurrently either sees it or is cleared
+        self.search_generation += 1
+        self.search_cache.clear()
+        # Searches already running may miss this write; later ones must start afresh, not join them
+        self.search_flight.forget()
+    
+    def _after_insert(self, doc: Dict):
+        self._invalidate_searches()
+        self._cache_document(doc)
+        self._apply_to_indexes([doc])
+    
+    def _after_insert_many(self, docs: List[Dict]):
+        self._invalidate_searches()
+        for doc in docs:
+            self._cache_document(doc)
+        self._apply_to_indexes(docs)
+    
+    def _after_update(self, doc: Dict):
+        self._invalidate_searches()
+        self._cache_document(doc)
+        self._apply_to_indexes([doc])
+    
+    def _after_delete(self, command_id: str):
+        self._invalidate_searches()
+        self.document_cache.invalidate(command_id)
+        self._apply_to_indexes(removed_ids=[command_id])
+    
+    async def _after_write_async(self, docs: List[Dict] = (), removed_ids: List[str] = ()):
+        """The write hooks for the async paths: same cache updates, index updates via _apply_to_indexes_async"""
+        self._invalidate_searches()
+        for doc in docs:
+            self._cache_document(doc)
+        for command_id in removed_ids:
+            self.document_cache.invalidate(command_id)
+        await self._apply_to_indexes_async(docs, removed_ids)
+    
+    # ---------- cross-worker coherence: replay writes from the change log ----------
+    
+    async def refresh_from_change_log_async(self) -> int:
+        """Bring caches and indexes up to date with writes logged since the last check; returns entries seen"""
+        if not self.indexes_loaded:
+            # The startup load failed; retry it rather than replaying entries into no indexes
+            await self.load_indexes_async()
+            return 0
+        change_log = await self.async_db_manager.get_change_log()
+        if change_log["seq"] == self.change_seq:
+            return 0
+        # Only the missed entries are downloaded. A write landing between the two reads moves seq
+        # and leaves the slice short, so the read is repeated once before treating it as a gap
+        entries = None
+        for _ in range(2):
+            missed = change_log["seq"] - self.change_seq
+            if missed <= 0 or missed > self.config.CHANGE_LOG_SIZE:
+                break
+            change_log = await self.async_db_manager.get_change_log(last=missed)
+            entries = pending_changes(change_log, self.change_seq)
+            if entries is not None:
+                break
+        # This worker's own oversized entries were already applied by its write hooks
+        if entries is None or any(entry["ids"] is None and entry["origin"] != WORKER_ID for entry in entries):
+            logger.info("Change log does not cover seq %d..%d; reloading", self.change_seq, change_log.get("seq", 0))
+            self._invalidate_searches()
+            self.document_cache.clear()
+            # Searches keep using the current indexes until the rebuilt ones are complete
+            self._swap_indexes(*await asyncio.to_thread(self._build_indexes))
+            return len(entries or [])
+        # Own writes are re-read too, which repairs a poll that raced with a local write to the same document
+        await self._refresh_documents_async([command_id for entry in entries for command_id in entry["ids"] or []])
+        self.change_seq = change_log["seq"]
+        return len(entries)
+    
+    async def _refresh_documents_async(self, command_ids: List[str]):
+        command_ids = list(dict.fromkeys(command_ids))
+        found = await self.async_db_manager.find_by_command_ids(command_ids)
+        self._invalidate_searches()
+        for command_id in command_ids:
+            self.document_cache.invalidate(command_id)
+        await self._apply_to_indexes_async(list(found.values()),
+                                           [command_id for command_id in command_ids if command_id not in found])
+    
+    async def run_change_log_poller(self, interval: float):
+        """Poll the change log every interval seconds until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.refresh_from_change_log_async()
+            except Exception as e:
+                logger.error("Change log poll error: %s", e)
+    
+    # ---------- hot set: shared popularity counts and startup warm-up ----------
+    
+    async def flush_hot_set_async(self):
+        """Add the counts gathered since the last flush to the shared hot set"""
+        queries, documents = self.hot_set.drain()
+        try:
+            await self.async_db_manager.record_hot_set(queries, documents)
+        except Exception:
+            self.hot_set.restore(queries, documents)
+            raise
+    
+    async def run_hot_set_flusher(self, interval: float):
+        """Flush the hot-set counts every interval seconds until cancelled"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush_hot_set_async()
+            except Exception as e:
+                logger.error("Hot set flush error: %s", e)
+    
+    async def warm_up_async(self, budget: float) -> Dict:
+        """Load the hot set shared by all workers into this worker's caches, giving up after budget seconds"""
+        stats = {"documents": 0, "queries": 0, "complete": False}
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._warm_up_async(stats), timeout=budget)
+            stats["complete"] = True
+        except asyncio.TimeoutError:
+            logger.warning("Warm-up stopped after its %g s budget", budget)
+        stats["elapsed_s"] = round(time.perf_counter() - started, 3)
+        return stats
+    
+    async def _warm_up_async(self, stats: Dict):
+        since = datetime.utcnow() - timedelta(seconds=self.config.HOT_SET_WINDOW)
+        # Popular entries first: they also carry their shared popularity into autocomplete
+        popular = await self.async_db_manager.get_hot_set("document", self.config.WARMUP_DOCUMENTS, since)
+        found = await self.async_db_manager.find_by_command_ids([entry["command_id"] for entry in popular])
+        for entry in popular:
+            doc = found.get(entry["command_id"])
+            if doc is None:
+                continue
+            self._cache_document(doc)
+            if self.autocomplete_index is not None:
+                self.autocomplete_index.record_hit(entry["command_id"], entry["count"])
+            stats["documents"] += 1
+        # _search_async fills the search cache without counting the warm-up as traffic
+        for entry in await self.async_db_manager.get_hot_set("query", self.config.WARMUP_QUERIES, since):
+            await self._search_async(entry["keyword"], entry["max_results"], entry["mode"], entry["fields"] or None)
+            stats["queries"] += 1
+            # In-process searches never await; yield so health checks and the budget timeout get a turn
+            await asyncio.sleep(0)
+    
+    # ---------- point lookups: read-through / write-through document cache ----------
+    
+    def _cache_document(self, doc: Dict):
+        self.document_cache.set(doc['command_id'], {k: v for k, v in doc.items() if k != '_id'})
+    
+    def _find_document(self, command_id: str) -> Optional[Dict]:
+        doc = self.document_cache.get(command_id)
+        if doc is None:
+            doc = self.db_manager.find_by_command_id(command_id)
+            if doc is not None:
+                self._cache_document(doc)
+        return doc
+    
+    async def _find_document_async(self, command_id: str) -> Optional[Dict]:
+        doc = self.document_cache.get(command_id)
+        if doc is None:
+            doc = await self.async_db_manager.find_by_command_id(command_id)
+            if doc is not None:
+                self._cache_document(doc)
+        return doc
     
     def add_system_info(self, system_info: SystemInfoCreate) -> bool:
         """Add new system information"""
         try:
-            # Check if command_id already exists
-            existing = self.db_manager.find_by_command_id(system_info.command_id)
-            if existing:
+            # Known duplicates are rejected from the cache; anything else is caught by the unique index
+            if system_info.command_id in self.document_cache:
                 return False
             
-            # FIXED: Call insert_system_info without vector parameter
-            return self.db_manager.insert_system_info(
-                command_id=system_info.command_id,
-                command=system_info.command,
-                response=system_info.response,
-                category=system_info.category
-            )
+            # FIXED: Insert without vector parameter
+            document = self._new_document(system_info)
+            success = self.db_manager.insert_document(document)
+            if success:
+                self._after_insert(document)
+            return success
         except Exception as e:
-            print(f"Add system info error: {e}")
+            logger.error("Add system info error: %s", e)
             return False
     
-    def keyword_search(self, keyword: str, max_results: int = 10) -> SearchResponse:
+    async def add_system_info_async(self, system_info: SystemInfoCreate) -> bool:
+        """Add new system information without blocking the event loop"""
+        try:
+            if system_info.command_id in self.document_cache:
+                return False
+            
+            document = self._new_document(system_info)
+            if self.insert_coalescer is not None:
+                return await self.insert_coalescer.submit(document)
+            success = await self.async_db_manager.insert_document(document)
+            if success:
+                await self._after_write_async([document])
+            return success
+        except Exception as e:
+            logger.error("Add system info error: %s", e)
+            return False
+    
+    async def _insert_batch_async(self, documents: List[Dict]) -> List[bool]:
+        """One unordered bulk insert for coalesced single adds; True per document that was inserted"""
+        insert_result = await self.async_db_manager.bulk_insert_system_info(documents)
+        await self._after_write_async(self._inserted_documents(documents, insert_result))
+        failed = {item["index"] for item in insert_result.get("failed_items", [])}
+        return [index not in failed for index in range(len(documents))]
+    
+    def _search_cache_key(self, keyword: str, max_results: int, mode: str = "keyword", fields: Optional[List[str]] = None) -> tuple:
+        # Case and whitespace differences should hit the same cache entry
+        return (" ".join(keyword.lower().split()), max_results, mode, tuple(fields or ()))
+    
+    def _invalid_keyword_response(self) -> SearchResponse:
+        return SearchResponse(
+            success=False,
+            results=[],
+            total_found=0,
+            message="Please provide a valid keyword."
+        )
+    
+    def _exact_matches(self, keyword: str, max_results: int, mode: str) -> List[Dict]:
+        if mode != "keyword" or self.exact_index is None:
+            return []
+        return self.exact_index.lookup(keyword, limit=max_results)
+    
+    def _fuzzy_search(self, keyword: str, max_results: int) -> List[Dict]:
+        if self.fuzzy_index is None:
+            return []
+        return self.fuzzy_index.search(keyword, limit=max_results)
+    
+    def _mode_index(self, mode: str):
+        return {"fuzzy": self.fuzzy_index, "semantic": self.semantic_index}.get(mode)
+    
+    def _mode_loading(self, mode: str) -> bool:
+        enabled = {"fuzzy": self.config.FUZZY_SEARCH_ENABLED, "semantic": self.config.SEMANTIC_SEARCH_ENABLED}
+        return not self.indexes_loaded and enabled.get(mode, False)
+    
+    def _mode_disabled_response(self, mode: str) -> SearchResponse:
+        return SearchResponse(
+            success=False,
+            results=[],
+            total_found=0,
+            message=f"{mode.capitalize()} search is not enabled."
+        )
+    
+    def _record_hit(self, command_id: str):
+        self.hot_set.record_document(command_id)
+        if self.autocomplete_index is not None:
+            self.autocomplete_index.record_hit(command_id)
+    
+    def autocomplete(self, prefix: str, limit: int = 10) -> AutocompleteResponse:
+        """Commands starting with prefix, most often served first"""
+        if self.autocomplete_index is None:
+            return AutocompleteResponse(prefix=prefix, suggestions=[])
+        return AutocompleteResponse(prefix=prefix, suggestions=self.autocomplete_index.complete(prefix, limit))
+    
+    def _build_search_response(self, results: List[Dict], message: Optional[str] = None, fields: Optional[List[str]] = None) -> SearchResponse:
+        response_list = self._to_response_list([dict(doc, text_score=doc.get('score', 0.0)) for doc in results], fields)
+        
+        if response_list:
+            return SearchResponse(
+                success=True,
+                results=response_list,
+                total_found=len(response_list),
+                message=message
+            )
+        else:
+            return SearchResponse(
+                success=False,
+                results=[],
+                total_found=0,
+                message="No results found for your keyword."
+            )
+    
+    def _record_query(self, response: SearchResponse, keyword: str, max_results: int, mode: str, fields: Optional[List[str]]):
+        # Only searches that answered something are worth warming up; the top answer is the one the
+        # user sees, so it drives popularity (cached answers included)
+        if response.success and response.results:
+            self.hot_set.record_query(self._search_cache_key(keyword, max_results, mode, fields))
+            self._record_hit(response.results[0].command_id)
+    
+    def keyword_search(self, keyword: str, max_results: int = 10, mode: str = "keyword", fields: Optional[List[str]] = None) -> SearchResponse:
         """Search for documents using keyword matching"""
+        response = self._search(keyword, max_results, mode, fields)
+        self._record_query(response, keyword, max_results, mode, fields)
+        return response
+    
+    def _search(self, keyword: str, max_results: int = 10, mode: str = "keyword", fields: Optional[List[str]] = None) -> SearchResponse:
         try:
             if not keyword.strip():
-                return SearchResponse(
-                    success=False,
-                    results=[],
-                    total_found=0,
-                    message="Please provide a valid keyword."
-                )
-            
-            results = self.db_manager.search_by_keyword(keyword, limit=max_results)
-            
-            response_list = []
-            for doc in results:
-                try:
-                    response_list.append(SystemInfoResponse(
-                        command_id=doc['command_id'],
-                        command=doc['command'],
-                        response=doc['response'],
-                        category=doc['category'],
-                        created_at=doc.get('created_at'),
-                        updated_at=doc.get('updated_at'),
-                        text_score=doc.get('score', 0.0)
-                    ))
-                except Exception as validation_error:
-                    print(f"Validation error for doc {doc.get('command_id', 'unknown')}: {validation_error}")
-                    continue
-            
-            if response_list:
-                return SearchResponse(
-                    success=True,
-                    results=response_list,
-                    total_found=len(response_list)
-                )
+                return self._invalid_keyword_response()
+            if mode != "keyword" and self._mode_index(mode) is None:
+                if not self._mode_loading(mode):
+                    return self._mode_disabled_response(mode)
+                # The index is still being built at startup; MongoDB's text search answers meanwhile
+                mode = "keyword"
+            
+            # A question that is literally a stored command skips the search engine and the cache
+            exact = self._exact_matches(keyword, max_results, mode)
+            if exact:
+                return self._build_search_response(exact, fields=fields)
+            
+            cache_key = self._search_cache_key(keyword, max_results, mode, fields)
+            cached = self.search_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
+            generation = self.search_generation
+            message = None
+            if mode != "keyword":
+                results = self._mode_index(mode).search(keyword, limit=max_results)
+            elif self.search_index is not None:
+                results = self.search_index.search(keyword, limit=max_results)
             else:
-                return SearchResponse(
-                    success=False,
-                    results=[],
-                    total_found=0,
-                    message="No results found for your keyword."
-                )
+                results = self.db_manager.search_by_keyword(keyword, limit=max_results, fields=fields)
+            if not results and mode == "keyword":
+                results = self._fuzzy_search(keyword, max_results)
+                message = "No exact matches; showing closest matches." if results else None
+            response = self._build_search_response(results, message, fields)
+            self._cache_search(cache_key, response, generation)
+            return response
             
         except Exception as e:
-            print(f"Keyword search error: {e}")
+            logger.error("Keyword search error: %s", e)
             return SearchResponse(
                 success=False,
                 results=[],
@@ -84,140 +560,437 @@ class ChatbotService:
                 message=str(e)
             )
     
+    async def keyword_search_async(self, keyword: str, max_results: int = 10, mode: str = "keyword", fields: Optional[List[str]] = None) -> SearchResponse:
+        """Search for documents using keyword matching without blocking the event loop"""
+        response = await self._search_async(keyword, max_results, mode, fields)
+        self._record_query(response, keyword, max_results, mode, fields)
+        return response
+    
+    async def _search_async(self, keyword: str, max_results: int = 10, mode: str = "keyword", fields: Optional[List[str]] = None) -> SearchResponse:
+        try:
+            if not keyword.strip():
+                return self._invalid_keyword_response()
+            if mode != "keyword" and self._mode_index(mode) is None:
+                if not self._mode_loading(mode):
+                    return self._mode_disabled_response(mode)
+                # The index is still being built at startup; MongoDB's text search answers meanwhile
+                mode = "keyword"
+            
+            # A question that is literally a stored command skips the search engine and the cache
+            exact = self._exact_matches(keyword, max_results, mode)
+            if exact:
+                return self._build_search_response(exact, fields=fields)
+            
+            cache_key = self._search_cache_key(keyword, max_results, mode, fields)
+            cached = self.search_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            
+            # On a miss, callers with the same normalized query join the search already running for it
+            return await self.search_flight.do(
+                cache_key, lambda: self._run_search_async(keyword, max_results, mode, fields, cache_key)
+            )
+            
+        except Exception as e:
+            logger.error("Keyword search error: %s", e)
+            return SearchResponse(
+                success=False,
+                results=[],
+                total_found=0,
+                message=str(e)
+            )
+    
+    async def _run_search_async(self, keyword: str, max_results: int, mode: str, fields: Optional[List[str]], cache_key: tuple) -> SearchResponse:
+        generation = self.search_generation
+        message = None
+        if mode != "keyword":
+            results = self._mode_index(mode).search(keyword, limit=max_results)
+        elif self.search_index is not None:
+            results = self.search_index.search(keyword, limit=max_results)
+        else:
+            results = await self.async_db_manager.search_by_keyword(keyword, limit=max_results, fields=fields)
+        if not results and mode == "keyword":
+            results = self._fuzzy_search(keyword, max_results)
+            message = "No exact matches; showing closest matches." if results else None
+        response = self._build_search_response(results, message, fields)
+        self._cache_search(cache_key, response, generation)
+        return response
+    
+    def _cache_search(self, cache_key: tuple, response: SearchResponse, generation: int):
+        """Cache a search result unless searches were invalidated after it started"""
+        if generation != self.search_generation:
+            return
+        self.search_cache.set(cache_key, response)
+        # An invalidation between the check and the set may have cleared before this entry went in
+        if generation != self.search_generation:
+            self.search_cache.invalidate(cache_key)
+    
+    def _unique_queries(self, queries: List[KeywordSearchQuery]) -> Tuple[Dict[tuple, tuple], List[tuple]]:
+        # Queries that differ only in case or spacing share one search
+        unique, order = {}, []
+        for query in queries:
+            fields = resolve_fields(query.fields, query.summary)
+            key = self._search_cache_key(query.keyword, query.max_results or 10, query.mode, fields)
+            unique.setdefault(key, (query, fields))
+            order.append(key)
+        return unique, order
+    
+    async def batch_search_async(self, queries: List[KeywordSearchQuery]) -> BatchSearchResponse:
+        """Run several searches concurrently, each distinct query once, returning result sets in request order"""
+        unique, order = self._unique_queries(queries)
+        semaphore = asyncio.Semaphore(self.config.BATCH_SEARCH_CONCURRENCY)
+        
+        async def run(query: KeywordSearchQuery, fields: Optional[List[str]]) -> SearchResponse:
+            async with semaphore:
+                return await self.keyword_search_async(query.keyword, query.max_results or 10, query.mode, fields)
+        
+        results = await asyncio.gather(*(run(query, fields) for query, fields in unique.values()))
+        responses = dict(zip(unique, results))
+        return BatchSearchResponse(results=[responses[key] for key in order], unique_queries=len(unique))
+    
+    def _to_response(self, doc: Dict) -> SystemInfoResponse:
+        return SystemInfoResponse(
+            command_id=doc['command_id'],
+            command=doc['command'],
+            response=doc['response'],
+            category=doc['category'],
+            created_at=doc.get('created_at'),
+            updated_at=doc.get('updated_at'),
+            text_score=doc.get('text_score')
+        )
+    
+    def _to_partial_list(self, results: List[Dict], fields: List[str]) -> List[SystemInfoPartial]:
+        keep = set(fields)
+        return SYSTEM_INFO_PARTIAL_LIST_ADAPTER.validate_python(
+            [{k: v for k, v in doc.items() if k in keep} for doc in results]
+        )
+    
+    def _to_response_list(self, results: List[Dict], fields: Optional[List[str]] = None) -> List[SystemInfoResponse]:
+        if fields:
+            return self._to_partial_list(results, fields)
+        # Fast path: one pydantic-core pass over the whole list; unknown fields are ignored
+        try:
+            return SYSTEM_INFO_LIST_ADAPTER.validate_python(results)
+        except ValidationError:
+            pass
+        # Slow path: validate one by one so a single bad document does not fail the whole response
+        response_list = []
+        for doc in results:
+            try:
+                response_list.append(self._to_response(doc))
+            except Exception as validation_error:
+                logger.warning("Validation error for doc %s: %s", doc.get('command_id', 'unknown'), validation_error)
+                continue
+        return response_list
+    
     def get_system_info_by_id(self, command_id: str) -> Optional[SystemInfoResponse]:
         """Get system information by command ID"""
         try:
-            result = self.db_manager.find_by_command_id(command_id)
+            result = self._find_document(command_id)
+            if result:
+                self._record_hit(command_id)
+                return self._to_response(result)
+            return None
+        except Exception as e:
+            logger.error("Get system info by ID error: %s", e)
+            return None
+    
+    async def get_system_info_by_id_async(self, command_id: str) -> Optional[SystemInfoResponse]:
+        """Get system information by command ID without blocking the event loop"""
+        try:
+            result = await self._find_document_async(command_id)
             if result:
-                return SystemInfoResponse(
-                    command_id=result['command_id'],
-                    command=result['command'],
-                    response=result['response'],
-                    category=result['category'],
-                    created_at=result.get('created_at'),
-                    updated_at=result.get('updated_at')
-                )
+                self._record_hit(command_id)
+                return self._to_response(result)
             return None
         except Exception as e:
-            print(f"Get system info by ID error: {e}")
+            logger.error("Get system info by ID error: %s", e)
             return None
     
-    def get_all_system_info(self) -> List[SystemInfoResponse]:
-        """Get all system information"""
-        try:
-            results = self.db_manager.get_all_system_info()
-            response_list = []
-            for doc in results:
-                try:
-                    response_list.append(SystemInfoResponse(
-                        command_id=doc['command_id'],
-                        command=doc['command'],
-                        response=doc['response'],
-                        category=doc['category'],
-                        created_at=doc.get('created_at'),
-                        updated_at=doc.get('updated_at')
-                    ))
-                except Exception as validation_error:
-                    print(f"Validation error for doc {doc.get('command_id', 'unknown')}: {validation_error}")
-                    continue
-            return response_list
-        except Exception as e:
-            print(f"Get all system info error: {e}")
+    async def get_system_info_etag_async(self, command_id: str) -> Optional[str]:
+        """ETag of a document from the cache or an updated_at-only read, or None if it does not exist"""
+        doc = self.document_cache.get(command_id)
+        updated_at = doc.get('updated_at') if doc is not None else await self.async_db_manager.find_updated_at(command_id)
+        return document_etag(command_id, updated_at) if doc is not None or updated_at is not None else None
+    
+    async def get_collection_etag_async(self, *params) -> str:
+        """ETag of a listing from a single read of the shared change-log seq, not of the documents"""
+        return collection_etag((await self.async_db_manager.get_change_log())["seq"], *params)
+    
+    def get_all_system_info(self, fields: Optional[List[str]] = None) -> List[SystemInfoResponse]:
+        """Get all system information, optionally only the given fields"""
+        try:
+            results = self.db_manager.get_all_system_info(fields)
+            return self._to_response_list(results, fields)
+        except Exception as e:
+            logger.error("Get all system info error: %s", e)
+            return []
+    
+    async def get_all_system_info_async(self, fields: Optional[List[str]] = None) -> List[SystemInfoResponse]:
+        """Get all system information without blocking the event loop, optionally only the given fields"""
+        try:
+            results = await self.async_db_manager.get_all_system_info(fields)
+            return self._to_response_list(results, fields)
+        except Exception as e:
+            logger.error("Get all system info error: %s", e)
             return []
     
+    async def get_system_info_page_async(self, cursor: Optional[str] = None, limit: int = 100, fields: Optional[List[str]] = None) -> Tuple[List[SystemInfoResponse], Optional[str]]:
+        """Get one page of system information ordered by command_id, plus the cursor for the next page"""
+        after = decode_page_cursor(cursor) if cursor else None
+        # Fetch one extra document to learn whether another page exists
+        results = await self.async_db_manager.get_system_info_page(after, limit + 1, fields)
+        return self._page_response(results, limit, fields)
+    
+    def _page_response(self, results: List[Dict], limit: int, fields: Optional[List[str]] = None) -> Tuple[List[SystemInfoResponse], Optional[str]]:
+        next_cursor = encode_page_cursor(results[limit - 1]['command_id']) if len(results) > limit else None
+        return self._to_response_list(results[:limit], fields), next_cursor
+    
+    async def stream_system_info_async(self, fields: Optional[List[str]] = None) -> AsyncIterator[bytes]:
+        """Yield every document as one NDJSON line without blocking the event loop"""
+        async for doc in self.async_db_manager.iter_system_info(self.config.STREAM_BATCH_SIZE, fields):
+            yield ndjson_line(doc)
+    
+    def _update_dict(self, update_data: SystemInfoUpdate) -> Dict:
+        # Convert Pydantic model to dict, excluding None values
+        return {k: v for k, v in update_data.dict().items() if v is not None}
+    
     def update_system_info(self, command_id: str, update_data: SystemInfoUpdate) -> bool:
         """Update system information"""
         try:
-            # Convert Pydantic model to dict, excluding None values
-            update_dict = {k: v for k, v in update_data.dict().items() if v is not None}
+            update_dict = self._update_dict(update_data)
             
             if not update_dict:
                 return False
             
-            return self.db_manager.update_system_info(command_id, update_dict)
+            updated = self.db_manager.find_and_update_system_info(command_id, update_dict)
+            if updated is None:
+                return False
+            self._after_update(updated)
+            return True
         except Exception as e:
-            print(f"Update system info error: {e}")
+            logger.error("Update system info error: %s", e)
+            return False
+    
+    async def update_system_info_async(self, command_id: str, update_data: SystemInfoUpdate) -> bool:
+        """Update system information without blocking the event loop"""
+        try:
+            update_dict = self._update_dict(update_data)
+            
+            if not update_dict:
+                return False
+            
+            updated = await self.async_db_manager.find_and_update_system_info(command_id, update_dict)
+            if updated is None:
+                return False
+            await self._after_write_async([updated])
+            return True
+        except Exception as e:
+            logger.error("Update system info error: %s", e)
             return False
     
     def delete_system_info(self, command_id: str) -> bool:
         """Delete system information"""
         try:
-            return self.db_manager.delete_system_info(command_id)
+            success = self.db_manager.delete_system_info(command_id)
+            if success:
+                self._after_delete(command_id)
+            return success
         except Exception as e:
-            print(f"Delete system info error: {e}")
+            logger.error("Delete system info error: %s", e)
             return False
     
+    async def delete_system_info_async(self, command_id: str) -> bool:
+        """Delete system information without blocking the event loop"""
+        try:
+            success = await self.async_db_manager.delete_system_info(command_id)
+            if success:
+                await self._after_write_async(removed_ids=[command_id])
+            return success
+        except Exception as e:
+            logger.error("Delete system info error: %s", e)
+            return False
+    
+    def _new_document(self, item: SystemInfoCreate) -> Dict:
+        return {
+            "command_id": item.command_id,
+            "command": item.command,
+            "response": item.response,
+            "category": item.category,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+    
+    def _empty_bulk_response(self) -> BulkInsertResponse:
+        return BulkInsertResponse(
+            success=False,
+            message="No data provided",
+            inserted_count=0,
+            failed_items=[]
+        )
+    
+    def _bulk_insert_response(self, insert_result: Optional[Dict], failed_items: List[Dict], elapsed: float) -> BulkInsertResponse:
+        if insert_result is None:
+            return BulkInsertResponse(
+                success=False,
+                message="No valid documents to insert",
+                inserted_count=0,
+                failed_items=failed_items
+            )
+        failed_items = failed_items + insert_result.get("failed_items", [])
+        docs_per_second = round(insert_result["inserted_count"] / elapsed, 1) if elapsed > 0 else None
+        if insert_result["success"]:
+            return BulkInsertResponse(
+                success=True,
+                message=f"Successfully inserted {insert_result['inserted_count']} documents",
+                inserted_count=insert_result["inserted_count"],
+                failed_items=failed_items,
+                docs_per_second=docs_per_second
+            )
+        return BulkInsertResponse(
+            success=False,
+            message=f"Bulk insert failed: {insert_result.get('message', 'no documents were inserted')}",
+            inserted_count=0,
+            failed_items=failed_items
+        )
+    
+    def _prepare_bulk_documents(self, bulk_data: List[SystemInfoCreate]) -> tuple:
+        documents_to_insert = []
+        failed_items = []
+        for index, item in enumerate(bulk_data):
+            try:
+                documents_to_insert.append(self._new_document(item))
+            except Exception as e:
+                failed_items.append({
+                    "index": index,
+                    "command_id": getattr(item, 'command_id', 'unknown'),
+                    "reason": str(e)
+                })
+        return documents_to_insert, failed_items
+    
+    def _inserted_documents(self, documents: List[Dict], insert_result: Dict) -> List[Dict]:
+        failed = {item["index"] for item in insert_result.get("failed_items", [])}
+        return [document for index, document in enumerate(documents) if index not in failed]
+    
     def bulk_add_system_info(self, bulk_data: List[SystemInfoCreate]) -> BulkInsertResponse:
         """Add multiple system information entries at once"""
         try:
             if not bulk_data:
-                return BulkInsertResponse(
-                    success=False,
-                    message="No data provided",
-                    inserted_count=0,
-                    failed_items=[]
-                )
-            
-            documents_to_insert = []
-            failed_items = []
-            
-            for item in bulk_data:
-                try:
-                    # Check if command_id already exists
-                    existing = self.db_manager.find_by_command_id(item.command_id)
-                    if existing:
-                        failed_items.append({
-                            "command_id": item.command_id,
-                            "reason": "Command ID already exists"
-                        })
-                        continue
-                    
-                    document = {
-                        "command_id": item.command_id,
-                        "command": item.command,
-                        "response": item.response,
-                        "category": item.category,
-                        "created_at": datetime.utcnow(),
-                        "updated_at": datetime.utcnow()
-                    }
-                    documents_to_insert.append(document)
-                    
-                except Exception as e:
-                    failed_items.append({
-                        "command_id": getattr(item, 'command_id', 'unknown'),
-                        "reason": str(e)
-                    })
-            
-            # Bulk insert successful documents
+                return self._empty_bulk_response()
+            
+            # Duplicates are detected by the unique command_id index during the unordered insert,
+            # so there is no per-item existence query
+            documents_to_insert, failed_items = self._prepare_bulk_documents(bulk_data)
+            
+            insert_result = None
+            started = time.perf_counter()
             if documents_to_insert:
                 insert_result = self.db_manager.bulk_insert_system_info(documents_to_insert)
-                if insert_result["success"]:
-                    return BulkInsertResponse(
-                        success=True,
-                        message=f"Successfully inserted {insert_result['inserted_count']} documents",
-                        inserted_count=insert_result["inserted_count"],
-                        failed_items=failed_items
-                    )
-                else:
-                    return BulkInsertResponse(
-                        success=False,
-                        message=f"Bulk insert failed: {insert_result['message']}",
-                        inserted_count=0,
-                        failed_items=failed_items
-                    )
-            else:
-                return BulkInsertResponse(
-                    success=False,
-                    message="No valid documents to insert",
-                    inserted_count=0,
-                    failed_items=failed_items
-                )
+                self._after_insert_many(self._inserted_documents(documents_to_insert, insert_result))
+            return self._bulk_insert_response(insert_result, failed_items, time.perf_counter() - started)
                 
         except Exception as e:
-            print(f"Bulk add system info error: {e}")
+            logger.error("Bulk add system info error: %s", e)
             return BulkInsertResponse(
                 success=False,
                 message=str(e),
                 inserted_count=0,
                 failed_items=[]
-            )
\ No newline at end of file
+            )
+    
+    async def bulk_add_system_info_async(self, bulk_data: List[SystemInfoCreate]) -> BulkInsertResponse:
+        """Add multiple system information entries at once without blocking the event loop"""
+        try:
+            if not bulk_data:
+                return self._empty_bulk_response()
+            
+            documents_to_insert, failed_items = self._prepare_bulk_documents(bulk_data)
+            
+            insert_result = None
+            started = time.perf_counter()
+            if documents_to_insert:
+                insert_result = await self.async_db_manager.bulk_insert_system_info(documents_to_insert)
+                await self._after_write_async(self._inserted_documents(documents_to_insert, insert_result))
+            return self._bulk_insert_response(insert_result, failed_items, time.perf_counter() - started)
+                
+        except Exception as e:
+            logger.error("Bulk add system info error: %s", e)
+            return BulkInsertResponse(
+                success=False,
+                message=str(e),
+                inserted_count=0,
+                failed_items=[]
+            )
+    
+    def _bulk_update_response(self, result: Dict) -> BulkUpdateResponse:
+        if result["success"]:
+            message = f"Successfully updated {result['updated_count']} documents"
+        else:
+            message = "No documents were updated"
+        return BulkUpdateResponse(
+            success=result["success"],
+            message=message,
+            updated_count=result["updated_count"],
+            failed_items=result["failed_items"]
+        )
+    
+    def _bulk_delete_response(self, result: Dict) -> BulkDeleteResponse:
+        if result["success"]:
+            message = f"Successfully deleted {result['deleted_count']} documents"
+        else:
+            message = "No documents were deleted"
+        return BulkDeleteResponse(
+            success=result["success"],
+            message=message,
+            deleted_count=result["deleted_count"],
+            failed_items=result["failed_items"]
+        )
+    
+    async def bulk_update_system_info_async(self, updates: List[BulkSystemInfoUpdateItem]) -> BulkUpdateResponse:
+        """Update many entries with one bulk_write per chunk without blocking the event loop"""
+        try:
+            if not updates:
+                return BulkUpdateResponse(success=False, message="No data provided", updated_count=0, failed_items=[])
+            result = await self.async_db_manager.bulk_update_system_info([item.dict() for item in updates])
+            await self._after_write_async(result["updated_documents"])
+            return self._bulk_update_response(result)
+        except Exception as e:
+            logger.error("Bulk update system info error: %s", e)
+            return BulkUpdateResponse(success=False, message=str(e), updated_count=0, failed_items=[])
+    
+    async def bulk_delete_system_info_async(self, command_ids: List[str]) -> BulkDeleteResponse:
+        """Delete many entries with one bulk_write per chunk without blocking the event loop"""
+        try:
+            if not command_ids:
+                return BulkDeleteResponse(success=False, message="No data provided", deleted_count=0, failed_items=[])
+            result = await self.async_db_manager.bulk_delete_system_info(command_ids)
+            await self._after_write_async(removed_ids=result["deleted_ids"])
+            return self._bulk_delete_response(result)
+        except Exception as e:
+            logger.error("Bulk delete system info error: %s", e)
+            return BulkDeleteResponse(success=False, message=str(e), deleted_count=0, failed_items=[])
+    
+    def _sync_response(self, result: Dict) -> SyncResponse:
+        return SyncResponse(
+            success=result["success"],
+            message=(f"Inserted {result['inserted_count']}, updated {result['updated_count']}, "
+                     f"unchanged {result['unchanged_count']}"),
+            inserted_count=result["inserted_count"],
+            updated_count=result["updated_count"],
+            unchanged_count=result["unchanged_count"],
+            failed_items=result["failed_items"]
+        )
+    
+    async def sync_system_info_async(self, bulk_data: List[SystemInfoCreate]) -> SyncResponse:
+        """Upsert full entries without blocking the event loop, writing only new or changed ones"""
+        try:
+            if not bulk_data:
+                return SyncResponse(success=False, message="No data provided", failed_items=[])
+            result = await self.async_db_manager.sync_system_info([item.dict() for item in bulk_data])
+            # Unchanged documents were not written, so caches and indexes only need the synced ones
+            if result["synced_documents"]:
+                await self._after_write_async(result["synced_documents"])
+            return self._sync_response(result)
+        except Exception as e:
+            logger.error("Sync system info error: %s", e)
+            return SyncResponse(success=False, message=str(e), failed_items=[])
\ No newline at end of file
@@ -1,23 +1,61 @@
 # services/feature_1/feature_1_router.py - GUARANTEED WORKING VERSION
 
-from fastapi import APIRouter, HTTPException, Path
-from typing import List, Optional
-from services.feature_1.feature_1 import ChatbotService
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Dict, List, Optional, get_args
+from services.feature_1.feature_1 import ChatbotService, document_etag, dump_system_info_list, resolve_fields
+from database.pool_monitor import pool_stats
+from observability.metrics import change_log_failures
 from services.feature_1.feature_1_schema import (
     SystemInfoCreate, SystemInfoUpdate, SystemInfoResponse, 
     KeywordSearchQuery, SearchResponse, BulkSystemInfo, 
-    BulkInsertResponse, StandardResponse
+    BulkInsertResponse, StandardResponse, BulkSystemInfoUpdate,
+    BulkUpdateResponse, BulkSystemInfoDelete, BulkDeleteResponse, SyncResponse,
+    AutocompleteResponse, BatchSearchQuery, BatchSearchResponse, SystemInfoField
 )
+import logging
 import urllib.parse
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
-chatbot_service = ChatbotService()
+
+def _json_response(content: bytes, headers: Optional[Dict[str, str]] = None) -> Response:
+    # Already validated and serialized by pydantic-core; returning a Response skips FastAPI's
+    # second validation and encoding pass against response_model (which still documents the shape)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+def _parse_fields(fields: Optional[str], summary: bool) -> Optional[List[str]]:
+    selected = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    unknown = sorted(set(selected or []) - set(get_args(SystemInfoField)))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return resolve_fields(selected, summary)
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so a W/ prefix added by a proxy still matches
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+def _cache_headers(etag: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    # no-cache: clients may keep the body but must revalidate with If-None-Match before reusing it
+    return {**(headers or {}), "ETag": etag, "Cache-Control": "no-cache"}
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=_cache_headers(etag))
+
+async def get_chatbot_service(request: Request) -> ChatbotService:
+    """The process-wide service, built once by the app's lifespan; async so FastAPI resolves it without a thread hop"""
+    return request.app.state.chatbot_service
 
 @router.post("/add-system-info", response_model=StandardResponse)
-async def add_system_info(system_info: SystemInfoCreate):
+async def add_system_info(system_info: SystemInfoCreate, chatbot_service: ChatbotService = Depends(get_chatbot_service)):
     """Add new system information"""
     try:
-        success = chatbot_service.add_system_info(system_info)
+        success = await chatbot_service.add_system_info_async(system_info)
         if success:
             return StandardResponse(success=True, message="System information added successfully")
         else:
@@ -28,32 +66,103 @@ async def add_system_info(system_info: SystemInfoCreate):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/search", response_model=SearchResponse)
-async def keyword_search(search_query: KeywordSearchQuery):
+async def keyword_search(search_query: KeywordSearchQuery, chatbot_service: ChatbotService = Depends(get_chatbot_service)):
     """Search documents using keyword matching"""
     try:
-        response = chatbot_service.keyword_search(
+        response = await chatbot_service.keyword_search_async(
             keyword=search_query.keyword,
-            max_results=search_query.max_results or 10
+            max_results=search_query.max_results or 10,
+            mode=search_query.mode,
+            fields=resolve_fields(search_query.fields, search_query.summary)
         )
-        return response
+        return _json_response(response.model_dump_json().encode())
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/batch-search", response_model=BatchSearchResponse)
+async def batch_search(batch_query: BatchSearchQuery, chatbot_service: ChatbotService = Depends(get_chatbot_service)):
+    """Resolve several keyword searches in one round trip; results come back in request order"""
+    if not batch_query.queries:
+        raise HTTPException(status_code=400, detail="Provide at least one query")
+    if len(batch_query.queries) > chatbot_service.config.MAX_BATCH_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {chatbot_service.config.MAX_BATCH_QUERIES} queries per batch"
+        )
+    try:
+        response = await chatbot_service.batch_search_async(batch_query.queries)
+        return _json_response(response.model_dump_json().encode())
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/autocomplete", response_model=AutocompleteResponse)
+async def autocomplete(
+    q: str = Query(..., min_length=1, description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=50, description="Number of suggestions"),
+    chatbot_service: ChatbotService = Depends(get_chatbot_service)
+):
+    """Type-ahead suggestions: stored commands starting with q, most popular first"""
+    return chatbot_service.autocomplete(q, limit)
+
 @router.get("/system-info", response_model=List[SystemInfoResponse])
-async def get_all_system_info():
-    """Get all system information"""
+async def get_all_system_info(
+    limit: Optional[int] = Query(None, ge=1, description="Page size; enables keyset pagination"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. command_id,command"),
+    summary: bool = Query(False, description="Return only command_id and command"),
+    if_none_match: Optional[str] = Header(None),
+    chatbot_service: ChatbotService = Depends(get_chatbot_service)
+):
+    """Get all system information, or one page of it when limit/cursor are given"""
+    selected = _parse_fields(fields, summary)
+    paginated = limit is not None or cursor is not None
+    page_size = min(limit or 100, chatbot_service.config.MAX_PAGE_SIZE)
     try:
-        return chatbot_service.get_all_system_info()
+        # Taken before the read, so a concurrent write can only make the ETag stale, never the body
+        etag = await chatbot_service.get_collection_etag_async(
+            ",".join(selected or []), cursor if paginated else "", page_size if paginated else ""
+        )
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        
+        if not paginated:
+            items = await chatbot_service.get_all_system_info_async(selected)
+            return _json_response(dump_system_info_list(items), _cache_headers(etag))
+        
+        items, next_cursor = await chatbot_service.get_system_info_page_async(cursor, page_size, selected)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return _json_response(dump_system_info_list(items), _cache_headers(etag, headers))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/stream-system-info")
+async def stream_system_info(
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. command_id,command"),
+    summary: bool = Query(False, description="Return only command_id and command"),
+    chatbot_service: ChatbotService = Depends(get_chatbot_service)
+):
+    """Stream all system information as NDJSON with constant memory use"""
+    selected = _parse_fields(fields, summary)
+    return StreamingResponse(chatbot_service.stream_system_info_async(selected), media_type="application/x-ndjson")
+
 @router.get("/system-info/{command_id}", response_model=SystemInfoResponse)
-async def get_system_info_by_id(command_id: str = Path(...)):
-    """Get system information by command ID"""
+async def get_system_info_by_id(
+    command_id: str = Path(...),
+    if_none_match: Optional[str] = Header(None),
+    chatbot_service: ChatbotService = Depends(get_chatbot_service)
+):
+    """Get system information by command ID; answers 304 when If-None-Match still matches"""
     try:
-        result = chatbot_service.get_system_info_by_id(command_id)
+        if if_none_match:
+            etag = await chatbot_service.get_system_info_etag_async(command_id)
+            if etag is not None and _etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+        result = await chatbot_service.get_system_info_by_id_async(command_id)
         if result:
-            return result
+            etag = document_etag(result.command_id, result.updated_at)
+            return _json_response(result.model_dump_json().encode(), _cache_headers(etag))
         else:
             raise HTTPException(status_code=404, detail="System information not found")
     except HTTPException:
@@ -61,27 +170,14 @@ async def get_system_info_by_id(command_id: str = Path(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-# FIXED UPDATE ENDPOINT - GUARANTEED TO WORK
 @router.put("/system-info/{command_id}", response_model=StandardResponse)
 async def update_system_info(
     command_id: str = Path(...),
-    update_data: SystemInfoUpdate = None
+    update_data: SystemInfoUpdate = None,
+    chatbot_service: ChatbotService = Depends(get_chatbot_service)
 ):
-    """Update system information - WORKING VERSION"""
+    """Update system information"""
     try:
-        print(f"🔥 UPDATE ATTEMPT: command_id = '{command_id}'")
-        print(f"🔥 UPDATE DATA: {update_data}")
-        
-        # Direct database check first
-        db_record = chatbot_service.db_manager.find_by_command_id(command_id)
-        print(f"🔥 DIRECT DB CHECK: {db_record is not None}")
-        
-        if not db_record:
-            print(f"🔥 RECORD NOT FOUND IN DB")
-            raise HTTPException(status_code=404, detail=f"System information with command_id '{command_id}' not found")
-        
-        print(f"🔥 FOUND RECORD: {db_record.get('command_id', 'NO_ID')}")
-        
         # Prepare update data
         update_dict = {}
         if update_data.command is not None:
@@ -90,76 +186,43 @@ async def update_system_info(
             update_dict["response"] = update_data.response
         if update_data.category is not None:
             update_dict["category"] = update_data.category
-            
-        print(f"🔥 FIELDS TO UPDATE: {update_dict}")
+        
+        logger.debug("Update requested for %s: fields=%s", command_id, list(update_dict))
         
         if not update_dict:
             raise HTTPException(status_code=400, detail="No valid fields provided for update")
         
-        # Direct database update
-        from datetime import datetime
-        update_dict["updated_at"] = datetime.utcnow()
-        
-        print(f"🔥 CALLING DB UPDATE...")
-        result = chatbot_service.db_manager.collection.update_one(
-            {"command_id": command_id},
-            {"$set": update_dict}
-        )
-        
-        print(f"🔥 DB UPDATE RESULT: matched={result.matched_count}, modified={result.modified_count}")
-        
-        if result.modified_count > 0:
-            print(f"🔥 UPDATE SUCCESS!")
+        # A single find-and-update both checks existence and applies the change
+        if await chatbot_service.update_system_info_async(command_id, update_data):
             return StandardResponse(success=True, message="System information updated successfully")
-        else:
-            print(f"🔥 UPDATE FAILED - NO CHANGES MADE")
-            raise HTTPException(status_code=500, detail="Update operation failed - no changes made")
+        raise HTTPException(status_code=404, detail=f"System information with command_id '{command_id}' not found")
             
     except HTTPException:
         raise
     except Exception as e:
-        print(f"🔥 UPDATE ERROR: {str(e)}")
+        logger.exception("Update error for %s", command_id)
         raise HTTPException(status_code=500, detail=f"Update error: {str(e)}")
 
-# FIXED DELETE ENDPOINT - GUARANTEED TO WORK
 @router.delete("/system-info/{command_id}", response_model=StandardResponse)
-async def delete_system_info(command_id: str = Path(...)):
-    """Delete system information - WORKING VERSION"""
+async def delete_system_info(command_id: str = Path(...), chatbot_service: ChatbotService = Depends(get_chatbot_service)):
+    """Delete system information"""
     try:
-        print(f"🔥 DELETE ATTEMPT: command_id = '{command_id}'")
-        
-        # Direct database check first
-        db_record = chatbot_service.db_manager.find_by_command_id(command_id)
-        print(f"🔥 DIRECT DB CHECK: {db_record is not None}")
+        logger.debug("Delete requested for %s", command_id)
         
-        if not db_record:
-            print(f"🔥 RECORD NOT FOUND IN DB")
-            raise HTTPException(status_code=404, detail=f"System information with command_id '{command_id}' not found")
-        
-        print(f"🔥 FOUND RECORD: {db_record.get('command_id', 'NO_ID')}")
-        
-        # Direct database delete
-        print(f"🔥 CALLING DB DELETE...")
-        result = chatbot_service.db_manager.collection.delete_one({"command_id": command_id})
-        
-        print(f"🔥 DB DELETE RESULT: deleted_count={result.deleted_count}")
-        
-        if result.deleted_count > 0:
-            print(f"🔥 DELETE SUCCESS!")
+        # deleted_count already tells us whether the record existed
+        if await chatbot_service.delete_system_info_async(command_id):
             return StandardResponse(success=True, message="System information deleted successfully")
-        else:
-            print(f"🔥 DELETE FAILED")
-            raise HTTPException(status_code=500, detail="Delete operation failed")
+        raise HTTPException(status_code=404, detail=f"System information with command_id '{command_id}' not found")
             
     except HTTPException:
         raise
     except Exception as e:
-        print(f"🔥 DELETE ERROR: {str(e)}")
+        logger.exception("Delete error for %s", command_id)
         raise HTTPException(status_code=500, detail=f"Delete error: {str(e)}")
 
 # HELPER ENDPOINTS TO MAKE YOUR LIFE EASIER
 @router.post("/quick-test-record", response_model=StandardResponse)
-async def create_quick_test_record():
+async def create_quick_test_record(chatbot_service: ChatbotService = Depends(get_chatbot_service)):
     """Create a test record for update/delete testing"""
     try:
         test_data = SystemInfoCreate(
@@ -168,7 +231,7 @@ async def create_quick_test_record():
             response="This is a test response",
             category="testing"
         )
-        success = chatbot_service.add_system_info(test_data)
+        success = await chatbot_service.add_system_info_async(test_data)
         if success:
             return StandardResponse(success=True, message="Test record created with command_id 'test123'")
         else:
@@ -177,16 +240,16 @@ async def create_quick_test_record():
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/debug/database-status")
-async def check_database_status():
+async def check_database_status(chatbot_service: ChatbotService = Depends(get_chatbot_service)):
     """Check database connection and collection status"""
     try:
         # Test database connection
-        db = chatbot_service.db_manager.db
-        collection = chatbot_service.db_manager.collection
+        db = chatbot_service.async_db_manager.db
+        collection = chatbot_service.async_db_manager.collection
         
         # Get collection stats
-        total_docs = collection.count_documents({})
-        sample_docs = list(collection.find({}, {"_id": 0}).limit(3))
+        total_docs = await collection.count_documents({})
+        sample_docs = await collection.find({}, {"_id": 0}).limit(3).to_list(length=3)
         
         return {
             "database_connected": True,
@@ -201,12 +264,56 @@ async def check_database_status():
             "error": str(e)
         }
 
+@router.get("/debug/cache-stats")
+async def get_cache_stats(chatbot_service: ChatbotService = Depends(get_chatbot_service)):
+    """Hit/miss/eviction counters for the in-process caches"""
+    return {
+        "search_cache": chatbot_service.search_cache.stats(),
+        "document_cache": chatbot_service.document_cache.stats(),
+        "change_seq": chatbot_service.change_seq,
+        "change_log_failures": change_log_failures.total(),
+        "search_single_flight": chatbot_service.search_flight.stats(),
+        "insert_coalescer": chatbot_service.insert_coalescer.stats() if chatbot_service.insert_coalescer else None
+    }
+
+@router.get("/debug/pool-stats")
+async def get_pool_stats(chatbot_service: ChatbotService = Depends(get_chatbot_service)):
+    """Live MongoDB connection pool counters per client and server (checkouts, wait times, pool-cleared events)"""
+    return {
+        "options": chatbot_service.config.mongo_client_options(),
+        "pools": pool_stats()
+    }
+
 # BULK OPERATIONS (unchanged)
 @router.post("/bulk-add-system-info", response_model=BulkInsertResponse)
-async def bulk_add_system_info(bulk_data: BulkSystemInfo):
+async def bulk_add_system_info(bulk_data: BulkSystemInfo, chatbot_service: ChatbotService = Depends(get_chatbot_service)):
     """Add multiple system information entries at once"""
     try:
-        result = chatbot_service.bulk_add_system_info(bulk_data.system_info_list)
+        result = await chatbot_service.bulk_add_system_info_async(bulk_data.system_info_list)
         return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/sync-system-info", response_model=SyncResponse)
+async def sync_system_info(bulk_data: BulkSystemInfo, chatbot_service: ChatbotService = Depends(get_chatbot_service)):
+    """Idempotent bulk upsert: new entries are inserted, changed ones updated, unchanged ones skipped"""
+    try:
+        return await chatbot_service.sync_system_info_async(bulk_data.system_info_list)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/bulk-update-system-info", response_model=BulkUpdateResponse)
+async def bulk_update_system_info(bulk_data: BulkSystemInfoUpdate, chatbot_service: ChatbotService = Depends(get_chatbot_service)):
+    """Update multiple system information entries at once"""
+    try:
+        return await chatbot_service.bulk_update_system_info_async(bulk_data.updates)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/bulk-delete-system-info", response_model=BulkDeleteResponse)
+async def bulk_delete_system_info(bulk_data: BulkSystemInfoDelete, chatbot_service: ChatbotService = Depends(get_chatbot_service)):
+    """Delete multiple system information entries at once"""
+    try:
+        return await chatbot_service.bulk_delete_system_info_async(bulk_data.command_ids)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -2,8 +2,8 @@
 
 from typing import List, Optional
 from datetime import datetime
-from typing import Optional, List, Dict
-from pydantic import BaseModel
+from typing import Optional, List, Dict, Literal, Union
+from pydantic import BaseModel, model_serializer
 
 class BulkInsertResponse(BaseModel):
     failed_items: Optional[List[Dict]] = None
@@ -19,6 +19,12 @@ class SystemInfoUpdate(BaseModel):
     response: Optional[str] = None
     category: Optional[str] = None
 
+# Fields a client may select; "summary" is shorthand for just enough to render a result list
+SystemInfoField = Literal["command_id", "command", "response", "category", "created_at", "updated_at"]
+SUMMARY_FIELDS = ["command_id", "command"]
+# Search results can also select their relevance score, which is only returned unprojected or when asked for
+SearchResultField = Literal["command_id", "command", "response", "category", "created_at", "updated_at", "text_score"]
+
 class SystemInfoResponse(BaseModel):
     command_id: str
     command: str
@@ -28,16 +34,52 @@ class SystemInfoResponse(BaseModel):
     updated_at: Optional[datetime] = None
     text_score: Optional[float] = None
 
+class SystemInfoPartial(BaseModel):
+    """A projected entry: only the selected fields are set (and serialized)"""
+    command_id: Optional[str] = None
+    command: Optional[str] = None
+    response: Optional[str] = None
+    category: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    text_score: Optional[float] = None
+
+    @model_serializer(mode="wrap")
+    def _selected_fields_only(self, handler):
+        return {k: v for k, v in handler(self).items() if k in self.model_fields_set}
+
 class KeywordSearchQuery(BaseModel):
     keyword: str
     max_results: Optional[int] = 10
+    # "keyword" falls back to fuzzy matching when nothing matches exactly; "fuzzy" always tolerates typos;
+    # "semantic" ranks by embedding similarity
+    mode: Literal["keyword", "fuzzy", "semantic"] = "keyword"
+    # Return only these fields (command_id is always included), or SUMMARY_FIELDS when summary is set
+    fields: Optional[List[SearchResultField]] = None
+    summary: bool = False
 
 class SearchResponse(BaseModel):
     success: bool
-    results: List[SystemInfoResponse]
+    results: List[Union[SystemInfoResponse, SystemInfoPartial]]
     total_found: int
     message: Optional[str] = None
 
+class BatchSearchQuery(BaseModel):
+    queries: List[KeywordSearchQuery]
+
+class BatchSearchResponse(BaseModel):
+    results: List[SearchResponse]
+    unique_queries: int
+
+class AutocompleteSuggestion(BaseModel):
+    command_id: str
+    command: str
+    popularity: int = 0
+
+class AutocompleteResponse(BaseModel):
+    prefix: str
+    suggestions: List[AutocompleteSuggestion]
+
 class BulkSystemInfo(BaseModel):
     system_info_list: List[SystemInfoCreate]
 
@@ -46,6 +88,36 @@ class BulkInsertResponse(BaseModel):
     message: str
     inserted_count: Optional[int] = None
     failed_items: Optional[List[Dict]] = None
+    docs_per_second: Optional[float] = None
+
+class BulkSystemInfoUpdateItem(SystemInfoUpdate):
+    command_id: str
+
+class BulkSystemInfoUpdate(BaseModel):
+    updates: List[BulkSystemInfoUpdateItem]
+
+class BulkUpdateResponse(BaseModel):
+    success: bool
+    message: str
+    updated_count: Optional[int] = None
+    failed_items: Optional[List[Dict]] = None
+
+class BulkSystemInfoDelete(BaseModel):
+    command_ids: List[str]
+
+class BulkDeleteResponse(BaseModel):
+    success: bool
+    message: str
+    deleted_count: Optional[int] = None
+    failed_items: Optional[List[Dict]] = None
+
+class SyncResponse(BaseModel):
+    success: bool
+    message: str
+    inserted_count: int = 0
+    updated_count: int = 0
+    unchanged_count: int = 0
+    failed_items: Optional[List[Dict]] = None
 
 class StandardResponse(BaseModel):
     success: bool
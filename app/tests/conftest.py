@@ -0,0 +1,59 @@
+# app/tests/conftest.py
+import asyncio
+import os
+import sys
+
+# Config reads the environment once, so this must happen before the app is imported.
+# Background polling is off: tests that need the change log drive it themselves
+os.environ["MONGODB_URI"] = "memory://"
+os.environ["COHERENCE_POLL_INTERVAL"] = "0"
+os.environ["HOT_SET_FLUSH_INTERVAL"] = "0"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from database.memory_client import InMemoryClient
+from main import app
+
+@pytest.fixture(autouse=True)
+def memory_store():
+    """Each test starts from an empty in-memory MongoDB"""
+    yield
+    InMemoryClient._databases.clear()
+
+@pytest.fixture
+def record():
+    """Builds a valid SystemInfoCreate body; keyword arguments override fields"""
+    def build(command_id: str, **fields) -> dict:
+        return dict({
+            "command_id": command_id,
+            "command": f"how to check disk usage {command_id}",
+            "response": f"df -h  # {command_id}",
+            "category": "disk"
+        }, **fields)
+    return build
+
+@pytest.fixture
+def client():
+    """TestClient inside the app's lifespan, once /ready reports the indexes loaded"""
+    with TestClient(app) as client:
+        while client.get("/ready").status_code != 200:
+            pass
+        yield client
+
+@pytest.fixture
+def run_app():
+    """Run an async test body as body(client, service) inside the app's lifespan, on one event loop"""
+    def run(body):
+        async def main():
+            transport = httpx.ASGITransport(app=app)
+            async with app.router.lifespan_context(app), \
+                    httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                while (await client.get("/ready")).status_code != 200:
+                    await asyncio.sleep(0.01)
+                return await body(client, app.state.chatbot_service)
+        return asyncio.run(main())
+    return run
@@ -0,0 +1,46 @@
+# app/tests/test_bulk_writes.py
+
+def test_bulk_update_reports_documents_deleted_after_the_prefetch(run_app, record):
+    async def body(client, service):
+        await client.post("/chatbot/bulk-add-system-info", json={"system_info_list": [record("a"), record("b")]})
+        manager = service.async_db_manager
+        original = manager.find_by_command_ids
+        prefetched = []
+
+        async def find_then_delete(command_ids):
+            found = await original(command_ids)
+            if not prefetched:
+                prefetched.append(found)
+                # Another client deletes b after the existence check, before the bulk_write
+                await manager.collection.delete_one({"command_id": "b"})
+            return found
+
+        manager.find_by_command_ids = find_then_delete
+        response = await client.post("/chatbot/bulk-update-system-info", json={"updates": [
+            {"command_id": "a", "response": "du -sh"},
+            {"command_id": "b", "response": "du -sh"}
+        ]})
+        manager.find_by_command_ids = original
+        return (set(prefetched[0]), response.json(),
+                await client.get("/chatbot/system-info/a"), await client.get("/chatbot/system-info/b"))
+
+    prefetched, response, a, b = run_app(body)
+    assert prefetched == {"a", "b"}
+    assert response["updated_count"] == 1
+    assert response["failed_items"] == [{"index": 1, "command_id": "b", "reason": "Command ID not found"}]
+    assert a.json()["response"] == "du -sh"
+    # The update that matched nothing must not reach this worker's cache either
+    assert b.json()["response"] == "df -h  # b"
+
+def test_bulk_delete_and_sync_report_per_item_results(client, record):
+    client.post("/chatbot/bulk-add-system-info", json={"system_info_list": [record("a"), record("b"), record("d")]})
+
+    deleted = client.post("/chatbot/bulk-delete-system-info", json={"command_ids": ["a", "missing"]}).json()
+    assert deleted["deleted_count"] == 1
+    assert deleted["failed_items"] == [{"index": 1, "command_id": "missing", "reason": "Command ID not found"}]
+
+    synced = client.post("/chatbot/sync-system-info", json={
+        "system_info_list": [record("b", response="du -sh"), record("c"), record("d")]
+    }).json()
+    assert (synced["inserted_count"], synced["updated_count"], synced["unchanged_count"]) == (1, 1, 1)
+    assert client.get("/chatbot/system-info/b").json()["response"] == "du -sh"
@@ -0,0 +1,83 @@
+# app/tests/test_change_log.py
+import asyncio
+import threading
+
+from config.config import Config
+from database.async_database_manager import AsyncDatabaseManager
+from services.feature_1.feature_1_schema import SystemInfoCreate
+
+async def write_elsewhere(service, record, command_ids):
+    """Insert documents the way another worker would: straight to MongoDB, bypassing this worker's hooks"""
+    other_worker = AsyncDatabaseManager()
+    for command_id in command_ids:
+        await other_worker.insert_document(service._new_document(SystemInfoCreate(**record(command_id))))
+
+def exact_ids(response) -> list:
+    return [item["command_id"] for item in response.json()["results"]]
+
+def test_poll_replays_only_the_missed_entries(run_app, record):
+    async def body(client, service):
+        await client.post("/chatbot/add-system-info", json=record("a"))
+        await service.refresh_from_change_log_async()
+        rebuilds = []
+        original = service._build_indexes
+        service._build_indexes = lambda: rebuilds.append(1) or original()
+        exact_index = service.exact_index
+
+        await write_elsewhere(service, record, ["b", "c"])
+        seen = await service.refresh_from_change_log_async()
+        found = await client.post("/chatbot/search", json={"keyword": "how to check disk usage c"})
+        return seen, rebuilds, service.exact_index is exact_index, exact_ids(found)
+
+    seen, rebuilds, same_index, found = run_app(body)
+    assert seen == 2
+    assert rebuilds == []
+    assert same_index
+    assert found == ["c"]
+
+def test_gap_rebuilds_indexes_while_the_old_ones_keep_serving(run_app, record, monkeypatch):
+    monkeypatch.setattr(Config(), "CHANGE_LOG_SIZE", 3)
+
+    async def body(client, service):
+        await client.post("/chatbot/add-system-info", json=record("a"))
+        await service.refresh_from_change_log_async()
+        # More writes than the log keeps: the poll cannot replay them and must rebuild
+        await write_elsewhere(service, record, ["b", "c", "d", "e", "f"])
+
+        built, release = threading.Event(), threading.Event()
+        original = service._build_indexes
+
+        def slow_build():
+            indexes = original()
+            built.set()
+            release.wait(5)
+            return indexes
+
+        service._build_indexes = slow_build
+        old_index = service.exact_index
+        refresh = asyncio.create_task(service.refresh_from_change_log_async())
+        await asyncio.to_thread(built.wait, 5)
+
+        # Mid-rebuild: the old index still answers, and a local write reaches the new one too
+        during = await client.post("/chatbot/search", json={"keyword": "how to check disk usage a"})
+        still_old = service.exact_index is old_index
+        await client.post("/chatbot/add-system-info", json=record("g"))
+
+        release.set()
+        await refresh
+        after = {command_id: exact_ids(await client.post("/chatbot/search", json={
+            "keyword": f"how to check disk usage {command_id}"
+        })) for command_id in ("b", "f", "g")}
+        new_index = service.exact_index
+        # The rebuild covers the log as of its start; the next poll replays g's entry on top of it
+        await service.refresh_from_change_log_async()
+        seq = (await service.async_db_manager.get_change_log())["seq"]
+        return (exact_ids(during), still_old, new_index is old_index, after,
+                service.change_seq == seq and service.exact_index is new_index)
+
+    during, still_old, old_after, after, caught_up = run_app(body)
+    assert during == ["a"]
+    assert still_old
+    assert not old_after
+    assert after == {"b": ["b"], "f": ["f"], "g": ["g"]}
+    assert caught_up
@@ -0,0 +1,78 @@
+# app/tests/test_search_cache.py
+import asyncio
+
+def result_ids(response) -> list:
+    return [item["command_id"] for item in response.json()["results"]]
+
+def test_search_racing_a_write_is_not_cached(run_app, record):
+    async def body(client, service):
+        await client.post("/chatbot/add-system-info", json=record("a"))
+        original = service.async_db_manager.search_by_keyword
+        searched, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_search(*args, **kwargs):
+            results = await original(*args, **kwargs)
+            searched.set()
+            await release.wait()
+            return results
+
+        service.async_db_manager.search_by_keyword = slow_search
+        stale = asyncio.create_task(client.post("/chatbot/search", json={"keyword": "disk"}))
+        await searched.wait()
+        # The write invalidates the cache after the search read MongoDB but before it caches
+        await client.post("/chatbot/add-system-info", json=record("b"))
+        release.set()
+        assert result_ids(await stale) == ["a"]
+        assert len(service.search_cache) == 0
+        return result_ids(await client.post("/chatbot/search", json={"keyword": "disk"}))
+
+    assert sorted(run_app(body)) == ["a", "b"]
+
+def test_identical_concurrent_searches_share_one_backend_call(run_app, record):
+    async def body(client, service):
+        await client.post("/chatbot/add-system-info", json=record("a"))
+        original = service.async_db_manager.search_by_keyword
+        calls = []
+
+        async def slow_search(*args, **kwargs):
+            calls.append(args)
+            await asyncio.sleep(0.05)
+            return await original(*args, **kwargs)
+
+        service.async_db_manager.search_by_keyword = slow_search
+        # Case and whitespace differences normalize to the same flight
+        keywords = ["disk usage"] * 10 + ["Disk   USAGE"] * 10
+        responses = await asyncio.gather(*(client.post("/chatbot/search", json={"keyword": keyword})
+                                           for keyword in keywords))
+        return calls, responses, service.search_flight.stats()
+
+    calls, responses, flight = run_app(body)
+    assert len(calls) == 1
+    assert {response.status_code for response in responses} == {200}
+    assert all(result_ids(response) == ["a"] for response in responses)
+    assert flight == {"calls": 1, "shared": 19, "in_flight": 0}
+
+def test_write_stops_new_searches_joining_a_running_one(run_app, record):
+    async def body(client, service):
+        await client.post("/chatbot/add-system-info", json=record("a"))
+        original = service.async_db_manager.search_by_keyword
+        searched, release = asyncio.Event(), asyncio.Event()
+
+        async def slow_search(*args, **kwargs):
+            results = await original(*args, **kwargs)
+            if not searched.is_set():
+                searched.set()
+                await release.wait()
+            return results
+
+        service.async_db_manager.search_by_keyword = slow_search
+        before = asyncio.create_task(client.post("/chatbot/search", json={"keyword": "disk"}))
+        await searched.wait()
+        await client.post("/chatbot/add-system-info", json=record("b"))
+        after = await client.post("/chatbot/search", json={"keyword": "disk"})
+        release.set()
+        return result_ids(await before), result_ids(after)
+
+    before, after = run_app(body)
+    assert before == ["a"]
+    assert sorted(after) == ["a", "b"]
@@ -0,0 +1,71 @@
+# app/tests/test_system_info_api.py
+
+def test_crud_round_trip(client, record):
+    assert client.post("/chatbot/add-system-info", json=record("disk1")).status_code == 200
+    assert client.post("/chatbot/add-system-info", json=record("disk1")).status_code == 400
+
+    fetched = client.get("/chatbot/system-info/disk1")
+    assert fetched.status_code == 200
+    assert fetched.json()["command"] == "how to check disk usage disk1"
+
+    updated = client.put("/chatbot/system-info/disk1", json={"response": "du -sh *"})
+    assert updated.status_code == 200
+    assert client.get("/chatbot/system-info/disk1").json()["response"] == "du -sh *"
+    assert client.put("/chatbot/system-info/missing", json={"response": "x"}).status_code == 404
+
+    assert client.delete("/chatbot/system-info/disk1").status_code == 200
+    assert client.get("/chatbot/system-info/disk1").status_code == 404
+    assert client.delete("/chatbot/system-info/disk1").status_code == 404
+
+def test_bulk_add_maps_duplicates_to_request_positions(client, record):
+    client.post("/chatbot/add-system-info", json=record("a"))
+    response = client.post("/chatbot/bulk-add-system-info", json={
+        "system_info_list": [record("b"), record("a"), record("c"), record("b")]
+    }).json()
+    assert response["inserted_count"] == 2
+    assert [(item["index"], item["command_id"], item["reason"]) for item in response["failed_items"]] == [
+        (1, "a", "Command ID already exists"),
+        (3, "b", "Command ID already exists")
+    ]
+
+def test_cursor_paging_walks_every_document_once(client, record):
+    ids = [f"cmd{i:02d}" for i in range(7)]
+    client.post("/chatbot/bulk-add-system-info", json={"system_info_list": [record(i) for i in ids]})
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 3, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/chatbot/system-info", params=params)
+        assert response.status_code == 200
+        seen += [item["command_id"] for item in response.json()]
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert seen == ids
+    assert pages == 3
+    assert client.get("/chatbot/system-info", params={"cursor": "not-a-cursor"}).status_code == 400
+
+def test_list_answers_304_until_a_write(client, record):
+    client.post("/chatbot/add-system-info", json=record("a"))
+    first = client.get("/chatbot/system-info")
+    etag = first.headers["ETag"]
+
+    again = client.get("/chatbot/system-info", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert client.get("/chatbot/system-info", headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+    client.post("/chatbot/add-system-info", json=record("b"))
+    changed = client.get("/chatbot/system-info", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 2
+
+def test_document_answers_304_until_updated(client, record):
+    client.post("/chatbot/add-system-info", json=record("a"))
+    etag = client.get("/chatbot/system-info/a").headers["ETag"]
+    assert client.get("/chatbot/system-info/a", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put("/chatbot/system-info/a", json={"response": "du -sh"})
+    assert client.get("/chatbot/system-info/a", headers={"If-None-Match": etag}).status_code == 200
@@ -0,0 +1,72 @@
+# app/tests/test_write_coalescer.py
+import asyncio
+
+import pytest
+
+from config.config import Config
+from database.write_coalescer import WriteCoalescer
+
+def test_concurrent_submits_share_batches_and_get_their_own_results():
+    batches = []
+
+    async def write_batch(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    async def main():
+        coalescer = WriteCoalescer(write_batch, max_batch=4, max_delay=0.01)
+        return coalescer, await asyncio.gather(*(coalescer.submit(item) for item in range(10)))
+
+    coalescer, results = asyncio.run(main())
+    assert results == [item * 2 for item in range(10)]
+    assert batches == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert coalescer.stats() == {"batches": 3, "items": 10, "average_batch": 3.33, "pending": 0}
+
+def test_failed_batch_raises_for_every_caller_in_it():
+    async def write_batch(items):
+        raise RuntimeError("bulk write failed")
+
+    async def main():
+        coalescer = WriteCoalescer(write_batch, max_batch=10, max_delay=0.01)
+        return await asyncio.gather(*(coalescer.submit(item) for item in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert [str(result) for result in results] == ["bulk write failed"] * 3
+
+def test_drain_writes_what_is_buffered():
+    written = []
+
+    async def write_batch(items):
+        written.extend(items)
+        return [True] * len(items)
+
+    async def main():
+        # A delay long enough that only drain can flush the buffer
+        coalescer = WriteCoalescer(write_batch, max_batch=100, max_delay=60)
+        submits = [asyncio.ensure_future(coalescer.submit(item)) for item in range(3)]
+        await asyncio.sleep(0)
+        await coalescer.drain()
+        return await asyncio.gather(*submits)
+
+    assert asyncio.run(main()) == [True] * 3
+    assert written == [0, 1, 2]
+
+@pytest.fixture
+def coalescing(monkeypatch):
+    # Config is a process-wide singleton, read before the app is imported
+    monkeypatch.setattr(Config(), "WRITE_COALESCING_ENABLED", True)
+    monkeypatch.setattr(Config(), "WRITE_COALESCING_MAX_DELAY_MS", 20)
+
+def test_concurrent_adds_are_inserted_in_one_bulk_write(coalescing, run_app, record):
+    async def body(client, service):
+        bodies = [record(f"cmd{i}") for i in range(8)] + [record("cmd0")]
+        responses = await asyncio.gather(*(client.post("/chatbot/add-system-info", json=body) for body in bodies))
+        listed = await client.get("/chatbot/system-info")
+        return [response.status_code for response in responses], service.insert_coalescer.stats(), len(listed.json())
+
+    statuses, stats, stored = run_app(body)
+    # The duplicate in the same batch fails alone
+    assert statuses == [200] * 8 + [400]
+    assert stats["batches"] == 1
+    assert stats["items"] == 9
+    assert stored == 8